@@ -1,37 +1,104 @@
 import random
+import re
 from itertools import combinations
 import json
 import sqlite3
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import requests
-import time
+import asyncio
 from functools import wraps
+from idea_space import IdeaBatch, IdeaSpaceEnumerator
+from integrations import AsyncIntegrationClient, IntegrationReadCache, NOT_MODIFIED, SUBMISSIONS
+from synergy import SynergyIndex
+from instrumentation import instrumentation
+from specification import Specification, as_dict
+from guideline_matcher import GuidelineMatcher
+from spec_sink import atomic_write
+from spec_store import SpecStore
+
+IMPACT_REPORT_SUBMISSIONS = ["cultural_impact", "community_feedback"]
 
 def track_processing_time(func):
+    # Records each call as an instrumentation span named after the method. Only the
+    # outermost engine span adds to performance_metrics["processing_time"], so nested
+    # calls are not counted twice, and calls made inside a "background" span (the
+    # integration cache's refresh threads) are not counted at all; nothing is
+    # tracked while instrumentation is disabled.
+    name = func.__qualname__
+
     @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        processing_time = end_time - start_time
-        if isinstance(args[0], AIIdeationEngine):
-            args[0].performance_metrics["processing_time"] += processing_time
+    def wrapper(self, *args, **kwargs):
+        if not instrumentation.enabled:
+            return func(self, *args, **kwargs)
+        outermost = not instrumentation.in_category("engine", "background")
+        with instrumentation.span(name, category="engine") as span:
+            result = func(self, *args, **kwargs)
+        if outermost:
+            self.performance_metrics["processing_time"] += span.duration_ns / 1e9
         return result
     return wrapper
 
+class SpecificationCache:
+    # Size-bounded LRU cache of specifications keyed by concept
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._specs = OrderedDict()
+
+    def get(self, concept):
+        spec = self._specs.get(concept)
+        if spec is None:
+            self.misses += 1
+            return None
+        self._specs.move_to_end(concept)
+        self.hits += 1
+        return spec
+
+    def put(self, concept, spec):
+        self._specs[concept] = spec
+        self._specs.move_to_end(concept)
+        while len(self._specs) > self.maxsize:
+            self._specs.popitem(last=False)
+
+    def invalidate(self, concept=None):
+        if concept is None:
+            self._specs.clear()
+        else:
+            self._specs.pop(concept, None)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._specs), "maxsize": self.maxsize}
+
+    def __len__(self):
+        return len(self._specs)
+
 class AIIdeationEngine:
-    def __init__(self):
+    def __init__(self, spec_seed=None, spec_cache_size=1024, db_path='knowledge_base.db'):
         self.concepts = ["AI", "robotics", "quantum computing", "neural networks", "blockchain", "virtual reality"]
         self.challenges = ["energy efficiency", "data privacy", "ethical decision-making", "human-AI collaboration"]
         self.city_metrics = {}
         self.survey_results = []
         self.ai_panel = ["AI Ethics Expert", "Technical Architect", "User Experience Specialist", "Resource Manager", "Integration Specialist"]
         self.human_experts = ["City Planner", "Environmental Scientist", "Social Psychologist", "Technology Ethicist", "AI Researcher"]
+        self.db_path = db_path
+        # tags.name -> tags.id, filled as tags are looked up or created
+        self.tag_ids = {}
+        # Inverted tag index for identify_synergies, loaded on first use
+        self.synergy_index = None
+        # RefinementEngine behind refine_concept, created on first use or by configure_refinement
+        self.refinement = None
         self.knowledge_base = self.initialize_knowledge_base()
         self.cultural_evolution_simulator = None
         self.community_cohesion_network = None
         self.cartographer_of_light = None
+        # Timeout/retry/pool settings passed to AsyncIntegrationClient
+        self.integration_options = {}
+        # TTL cache in front of the trends, needs and layout reads
+        self.integration_cache = IntegrationReadCache()
         self.ethical_guidelines = self.load_ethical_guidelines()
+        # Compiled from the guideline keys; rebuilt by update_ethical_guidelines
+        self.guideline_matcher = GuidelineMatcher(self.ethical_guidelines)
         self.ethical_review_board = ["Ethics Committee Chair", "Human Rights Advocate", "AI Safety Researcher", "Philosophy Professor", "Public Policy Expert"]
         self.performance_metrics = {
             "ideas_generated": 0,
@@ -44,6 +111,11 @@ class AIIdeationEngine:
             "implementation_rate": 0,
             "user_satisfaction": 0
         }
+        # Random source for specifications and refinement; spec_seed makes each
+        # concept's specification deterministic
+        self.rng = random
+        self.spec_seed = spec_seed
+        self.spec_cache = SpecificationCache(spec_cache_size)
 
     @track_processing_time
     def generate_ideas(self, num_ideas=5):
@@ -56,6 +128,21 @@ class AIIdeationEngine:
         self.performance_metrics["ideas_generated"] += len(ideas)
         return ideas
 
+    @track_processing_time
+    def generate_idea_batch(self, num_ideas=5, seed=None):
+        # Vectorized variant of generate_ideas: draws every concept pair and challenge
+        # at once and returns an IdeaBatch whose strings are built on access
+        batch = IdeaBatch.draw(self.concepts, self.challenges, num_ideas, seed=seed)
+        self.performance_metrics["ideas_generated"] += len(batch)
+        return batch
+
+    def enumerate_ideas(self, seed=0, cursor=None):
+        # Streams each distinct (concept pair, challenge) idea exactly once in a seeded
+        # shuffled order; pass a saved enumerator.cursor() back in to resume a run
+        if cursor is not None:
+            return IdeaSpaceEnumerator.resume(self.concepts, self.challenges, cursor, metrics=self.performance_metrics)
+        return IdeaSpaceEnumerator(self.concepts, self.challenges, seed=seed, metrics=self.performance_metrics)
+
     def analyze_trends(self):
         # Analyze current trends based on city metrics and survey results
         trends = []
@@ -121,7 +208,23 @@ class AIIdeationEngine:
         desired_capabilities = set(need.lower() for need in self.analyze_needs())
         return list(desired_capabilities - current_capabilities)
 
+    @track_processing_time
+    def get_specification(self, concept):
+        # Develops a concept's specification once and serves it from the cache afterwards
+        spec = self.spec_cache.get(concept)
+        if spec is None:
+            spec = self.develop_specification(concept)
+            self.spec_cache.put(concept, spec)
+        return spec
+
+    def specification_rng(self, concept):
+        if self.spec_seed is None:
+            return self.rng
+        return random.Random(f"{self.spec_seed}:{concept}")
+
+    @track_processing_time
     def develop_specification(self, concept):
+        rng = self.specification_rng(concept)
         spec = {
             "name": concept,
             "purpose": f"To address {concept.split('address ')[-1]}",
@@ -134,39 +237,41 @@ class AIIdeationEngine:
         
         # Generate key features
         for _ in range(3):
-            feature = f"Feature related to {random.choice(self.concepts)}"
+            feature = f"Feature related to {rng.choice(self.concepts)}"
             spec["key_features"].append(feature)
         
         # Generate required resources
         resources = ["computing power", "data storage", "network bandwidth", "specialized hardware"]
-        spec["required_resources"] = random.sample(resources, 2)
+        spec["required_resources"] = rng.sample(resources, 2)
         
         # Generate potential challenges
         challenges = ["scalability", "data privacy", "user adoption", "technical complexity"]
-        spec["potential_challenges"] = random.sample(challenges, 2)
+        spec["potential_challenges"] = rng.sample(challenges, 2)
         
         # Generate integration points
         systems = ["Cultural Evolution Simulator", "Community Cohesion Network", "Cartographer of Light"]
-        spec["integration_points"] = random.sample(systems, 2)
+        spec["integration_points"] = rng.sample(systems, 2)
         
         # Generate ethical considerations
-        spec["ethical_considerations"] = self.generate_ethical_considerations(spec)
+        spec["ethical_considerations"] = self.generate_ethical_considerations(spec, rng)
         
         return spec
 
-    def generate_ethical_considerations(self, spec):
+    def generate_ethical_considerations(self, spec, rng=None):
+        rng = rng or self.rng
         considerations = []
         for guideline, description in self.ethical_guidelines.items():
-            if random.random() < 0.5:  # 50% chance to include each guideline
+            if rng.random() < 0.5:  # 50% chance to include each guideline
                 considerations.append(f"{guideline.capitalize()}: {description}")
         return considerations
 
+    @track_processing_time
     def save_specification(self, spec, filename):
-        with open(filename, 'w') as f:
-            json.dump(spec, f, indent=2)
+        atomic_write(filename, json.dumps(as_dict(spec), indent=2))
 
+    @track_processing_time
     def assess_feasibility(self, concept):
-        spec = self.develop_specification(concept)
+        spec = self.get_specification(concept)
         
         # Technical feasibility
         tech_feasibility = self.assess_technical_feasibility(spec)
@@ -200,24 +305,29 @@ class AIIdeationEngine:
 
     def assess_ethical_feasibility(self, spec):
         #Improved ethical feasibility assessment
+        # Each guideline mentioned in a consideration adds 0.2
         ethical_score = 0
         for consideration in spec["ethical_considerations"]:
-            if "privacy" in consideration.lower():
-                ethical_score += 0.2
-            if "fairness" in consideration.lower():
-                ethical_score += 0.2
-            if "transparency" in consideration.lower():
-                ethical_score += 0.2
-            if "accountability" in consideration.lower():
-                ethical_score += 0.2
-            if "safety" in consideration.lower():
+            for _ in range(self.guideline_matcher.count(consideration)):
                 ethical_score += 0.2
         
         ethical_feasibility = min(1.0, ethical_score)
         return ethical_feasibility
 
+    @track_processing_time
+    def score_specs_batch(self, specs):
+        # Feasibility components, overall feasibility and impact for many specs at once
+        # as NumPy arrays; values are identical to the per-spec methods
+        from batch_scoring import score_specs
+
+        return score_specs(specs, self.guideline_matcher)
+
+    def score_concepts_batch(self, concepts):
+        return self.score_specs_batch([self.get_specification(concept) for concept in concepts])
+
+    @track_processing_time
     def estimate_impact(self, concept):
-        spec = self.develop_specification(concept)
+        spec = self.get_specification(concept)
         
         # Simplified impact assessment
         feature_impact = len(spec["key_features"]) * 0.2
@@ -228,7 +338,7 @@ class AIIdeationEngine:
         return max(0.0, min(1.0, overall_impact))
 
     def estimate_resource_requirements(self, concept):
-        spec = self.develop_specification(concept)
+        spec = self.get_specification(concept)
         
         # Simplified resource estimation
         compute_power = len(spec["key_features"]) * 10  # Arbitrary units
@@ -241,51 +351,66 @@ class AIIdeationEngine:
             "development_time": development_time
         }
 
+    def configure_refinement(self, **options):
+        # Options are passed to RefinementEngine: rounds, panel, selections_per_round, max_workers
+        from refinement import RefinementEngine
+
+        if self.refinement is not None:
+            self.refinement.close()
+        self.refinement = RefinementEngine(self, **options)
+        return self.refinement
+
+    def get_refinement(self):
+        if self.refinement is None:
+            self.configure_refinement()
+        return self.refinement
+
+    @track_processing_time
     def refine_concept(self, concept):
-        spec = self.develop_specification(concept)
-        
-        # Collaborative refinement process
-        for _ in range(3):  # Three rounds of refinement
-            ai_feedback = self.get_ai_panel_feedback(spec)
-            human_feedback = self.get_human_expert_feedback(spec)
-            ethical_feedback = self.get_ethical_review_board_feedback(spec)
-            
-            spec = self.incorporate_feedback(spec, ai_feedback, human_feedback, ethical_feedback)
-        
-        return spec
+        # Collaborative refinement process, see refinement.RefinementEngine
+        return self.get_refinement().refine(concept)
 
+    @track_processing_time
+    def refine_concepts(self, concepts, max_workers=4):
+        return self.get_refinement().refine_many(concepts, max_workers)
+
+    @track_processing_time
     def get_ai_panel_feedback(self, spec):
         feedback = []
         for ai_expert in self.ai_panel:
             feedback.append(f"{ai_expert} suggests: {self.generate_ai_feedback(ai_expert, spec)}")
         return feedback
 
+    @track_processing_time
     def get_human_expert_feedback(self, spec):
         feedback = []
         for human_expert in self.human_experts:
             feedback.append(f"{human_expert} recommends: {self.generate_human_feedback(human_expert, spec)}")
         return feedback
 
+    @track_processing_time
     def get_ethical_review_board_feedback(self, spec):
         feedback = []
         for board_member in self.ethical_review_board:
             feedback.append(f"{board_member} advises: {self.generate_ethical_feedback(board_member, spec)}")
         return feedback
 
-    def generate_ai_feedback(self, ai_expert, spec):
+    def generate_ai_feedback(self, ai_expert, spec, rng=None):
+        rng = rng or self.rng
         # Simplified AI feedback generation
         if ai_expert == "AI Ethics Expert":
-            return f"Consider the ethical implication of {random.choice(spec['key_features'])}"
+            return f"Consider the ethical implication of {rng.choice(spec['key_features'])}"
         elif ai_expert == "Technical Architect":
-            return f"Optimize the implementation of {random.choice(spec['key_features'])}"
+            return f"Optimize the implementation of {rng.choice(spec['key_features'])}"
         elif ai_expert == "User Experience Specialist":
             return "Improve the user interface for better accessibility"
         elif ai_expert == "Resource Manager":
-            return f"Reduce the resource requirement for {random.choice(spec['required_resources'])}"
+            return f"Reduce the resource requirement for {rng.choice(spec['required_resources'])}"
         elif ai_expert == "Integration Specialist":
-            return f"Enhance integration with {random.choice(spec['integration_points'])}"
+            return f"Enhance integration with {rng.choice(spec['integration_points'])}"
 
-    def generate_human_feedback(self, human_expert, spec):
+    def generate_human_feedback(self, human_expert, spec, rng=None):
+        rng = rng or self.rng
         # Simplified human feedback generation
         if human_expert == "City Planner":
             return "Consider the impact on urban infrastructure"
@@ -294,14 +419,18 @@ class AIIdeationEngine:
         elif human_expert == "Social Psychologist":
             return "Assess the social implications and potential behavioral changes"
         elif human_expert == "Technology Ethicist":
-            return f"Address the ethical concerns related to {random.choice(spec['ethical_considerations'])}"
+            # A specification can start without any ethical considerations
+            if not spec['ethical_considerations']:
+                return "Identify the ethical concerns this concept raises"
+            return f"Address the ethical concerns related to {rng.choice(spec['ethical_considerations'])}"
         elif human_expert == "AI Researcher":
             return "Explore potential advancements in AI algorithms to enhance functionality"
 
-    def generate_ethical_feedback(self, board_member, spec):
+    def generate_ethical_feedback(self, board_member, spec, rng=None):
+        rng = rng or self.rng
         # Simplified ethical feedback generation
         if board_member == "Ethics Committee Chair":
-            return f"Ensure compliance with ethical guideline: {random.choice(list(self.ethical_guidelines.keys()))}"
+            return f"Ensure compliance with ethical guideline: {rng.choice(list(self.ethical_guidelines.keys()))}"
         elif board_member == "Human Rights Advocate":
             return "Consider the impact on individual rights and freedoms"
         elif board_member == "AI Safety Researcher":
@@ -311,43 +440,179 @@ class AIIdeationEngine:
         elif board_member == "Public Policy Expert":
             return "Assess the potential impact on existing policies and regulations"
 
-    def incorporate_feedback(self, spec, ai_feedback, human_feedback, ethical_feedback):
+    def present_guidelines(self, spec):
+        # Guideline names the spec's ethical considerations already cover
+        return {c.split(":")[0].lower().strip() for c in spec["ethical_considerations"]}
+
+    @track_processing_time
+    def incorporate_feedback(self, spec, ai_feedback, human_feedback, ethical_feedback, present_guidelines=None):
         # Simplified feedback incorporation
         all_feedback = ai_feedback + human_feedback + ethical_feedback
-        new_feature = random.choice(all_feedback).split(": ")[1]
+        return self.apply_feedback(spec, self.rng.choice(all_feedback), present_guidelines)
+
+    @track_processing_time
+    def apply_feedback(self, spec, feedback, present_guidelines=None, rng=None):
+        rng = rng or self.rng
+        # Feedback is "<member> <verb>: <text>"; feedback from experts that do not
+        # use that format (e.g. plain LLM output) is taken whole
+        parts = feedback.split(": ")
+        new_feature = parts[1] if len(parts) > 1 else feedback
         spec["key_features"].append(new_feature)
         
-        # Add a new ethical consideration based on feedback
-        new_ethical_concern = random.choice(list(self.ethical_guidelines.keys()))
-        if new_ethical_concern not in [c.split(":")[0].lower().strip() for c in spec["ethical_considerations"]]:
+        # Add a new ethical consideration based on feedback. Refinement passes the
+        # same present_guidelines set through every round instead of re-parsing them.
+        if present_guidelines is None:
+            present_guidelines = self.present_guidelines(spec)
+        new_ethical_concern = rng.choice(list(self.ethical_guidelines.keys()))
+        if new_ethical_concern not in present_guidelines:
             spec["ethical_considerations"].append(f"{new_ethical_concern.capitalize()}: {self.ethical_guidelines[new_ethical_concern]}")
+            present_guidelines.add(new_ethical_concern)
         
         return spec
 
+    def load_specifications(self, batch_size=10000):
+        # Streams every stored specification as a compact Specification, for analyses
+        # that need many specs in memory at once
+        c = self.knowledge_base.cursor()
+        # Rows from before the spec store still hold their JSON inline
+        c.execute("""SELECT COALESCE(s.spec_json, b.spec_json) FROM specifications s
+                     LEFT JOIN spec_blobs b ON b.hash = s.spec_hash ORDER BY s.id""")
+        while True:
+            rows = c.fetchmany(batch_size)
+            if not rows:
+                break
+            for (spec_json,) in rows:
+                yield Specification.from_dict(json.loads(spec_json))
+
+    def get_tag_id(self, cursor, tag, new_tag_ids):
+        # Ids of tags created in the current transaction go to new_tag_ids; callers
+        # merge them into self.tag_ids only once the transaction has committed, so a
+        # rollback never leaves ids of tags that do not exist in the cache
+        tag_id = self.tag_ids.get(tag) or new_tag_ids.get(tag)
+        if tag_id is None:
+            cursor.execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag,))
+            cursor.execute("SELECT id FROM tags WHERE name = ?", (tag,))
+            tag_id = cursor.fetchone()[0]
+            new_tag_ids[tag] = tag_id
+        return tag_id
+
+    @track_processing_time
     def add_concept_to_knowledge_base(self, concept, spec):
         c = self.knowledge_base.cursor()
+        new_tag_ids = {}
         
-        # Add concept
-        c.execute("INSERT INTO concepts (name, description) VALUES (?, ?)",
-                  (concept, spec['purpose']))
-        concept_id = c.lastrowid
-        
-        # Add specification
-        c.execute("INSERT INTO specifications (concept_id, spec_json) VALUES (?, ?)",
-                  (concept_id, json.dumps(spec)))
-        
-        # Add tags
-        for feature in spec['key_features']:
-            tag = feature.split()[-1]  # Use the last word of the feature as a tag
-            c.execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag,))
-            c.execute("SELECT id FROM tags WHERE name = ?", (tag,))
-            tag_id = c.fetchone()[0]
-            c.execute("INSERT INTO concept_tags (concept_id, tag_id) VALUES (?, ?)",
-                      (concept_id, tag_id))
+        with self.knowledge_base:
+            # Add concept
+            c.execute("INSERT INTO concepts (name, description) VALUES (?, ?)",
+                      (concept, spec['purpose']))
+            concept_id = c.lastrowid
+            
+            # Add specification (stored once per distinct content in spec_blobs)
+            c.execute("INSERT INTO specifications (concept_id, spec_hash) VALUES (?, ?)",
+                      (concept_id, self.spec_store.put(c, spec)))
+            
+            # Add tags
+            tags = []
+            tag_ids = []
+            for feature in spec['key_features']:
+                tag = feature.split()[-1]  # Use the last word of the feature as a tag
+                tags.append(tag)
+                tag_ids.append(self.get_tag_id(c, tag, new_tag_ids))
+                c.execute("INSERT INTO concept_tags (concept_id, tag_id) VALUES (?, ?)",
+                          (concept_id, tag_ids[-1]))
+            
+            if self.fts_enabled:
+                c.execute("INSERT INTO concepts_fts (rowid, name, description, tags) VALUES (?, ?, ?, ?)",
+                          (concept_id, concept, spec['purpose'], " ".join(tags)))
         
-        self.knowledge_base.commit()
+        self.tag_ids.update(new_tag_ids)
+        if self.synergy_index is not None:
+            self.synergy_index.add(concept_id, tag_ids)
 
-    def search_concepts(self, query):
+    @track_processing_time
+    def add_concepts_bulk(self, concepts_and_specs, batch_size=10000):
+        # Ingests (concept, spec) pairs with executemany, one transaction per batch.
+        # Concept ids are assigned up front so rows for all three tables can be built
+        # before touching the database; this assumes a single writer.
+        c = self.knowledge_base.cursor()
+        batch = []
+        added = 0
+        for item in concepts_and_specs:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                added += self.write_concept_batch(c, batch)
+                batch = []
+        if batch:
+            added += self.write_concept_batch(c, batch)
+        return added
+
+    def write_concept_batch(self, c, batch):
+        new_tag_ids = {}
+        with self.knowledge_base:
+            c.execute("SELECT COALESCE(MAX(id), 0) FROM concepts")
+            concept_id = c.fetchone()[0]
+            concept_rows, tag_rows, fts_rows = [], [], []
+            for concept, spec in batch:
+                concept_id += 1
+                concept_rows.append((concept_id, concept, spec['purpose']))
+                tags = [feature.split()[-1] for feature in spec['key_features']]
+                for tag in tags:
+                    tag_rows.append((concept_id, self.get_tag_id(c, tag, new_tag_ids)))
+                fts_rows.append((concept_id, concept, spec['purpose'], " ".join(tags)))
+            c.executemany("INSERT INTO concepts (id, name, description) VALUES (?, ?, ?)", concept_rows)
+            spec_hashes = self.spec_store.put_many(c, [spec for _, spec in batch])
+            c.executemany("INSERT INTO specifications (concept_id, spec_hash) VALUES (?, ?)",
+                          zip((row[0] for row in concept_rows), spec_hashes))
+            c.executemany("INSERT INTO concept_tags (concept_id, tag_id) VALUES (?, ?)", tag_rows)
+            if self.fts_enabled:
+                c.executemany("INSERT INTO concepts_fts (rowid, name, description, tags) VALUES (?, ?, ?, ?)", fts_rows)
+        self.tag_ids.update(new_tag_ids)
+        if self.synergy_index is not None:
+            tags_by_concept = defaultdict(list)
+            for concept_id, tag_id in tag_rows:
+                tags_by_concept[concept_id].append(tag_id)
+            for concept_id, tag_ids in tags_by_concept.items():
+                self.synergy_index.add(concept_id, tag_ids)
+        return len(batch)
+
+    def fts_query(self, query, prefix=True):
+        # Match the words as one quoted phrase, like the substring LIKE search did, so user
+        # text can't inject FTS5 syntax; a trailing * makes the last word a prefix match
+        words = re.findall(r"\w+", query)
+        if not words:
+            return None
+        suffix = "*" if prefix else ""
+        return f'"{" ".join(words)}"{suffix}'
+
+    @track_processing_time
+    def search_concepts(self, query, limit=None, offset=0, prefix=True):
+        # With the FTS index, matching is by whole words: the query's words must appear
+        # in order as words of the name, description or tags, and with prefix=True the
+        # last word may also start a longer word ("energy eff" matches "energy
+        # efficiency"). Unlike the LIKE search it replaced, "AI" does not match inside
+        # "blockchAIn". A query without any word characters ("", "?!") has nothing to
+        # match on and falls back to the LIKE search, which treats it as a substring
+        # (so "" still returns every concept).
+        expression = self.fts_query(query, prefix) if self.fts_enabled else None
+        if expression is None:
+            return self.like_search(query, limit, offset)
+
+        c = self.knowledge_base.cursor()
+        # Best bm25 score first; identical concepts stored twice are reported once
+        c.execute("""
+            WITH hits AS MATERIALIZED (
+                SELECT name, description, bm25(concepts_fts) AS score
+                FROM concepts_fts WHERE concepts_fts MATCH ?
+            )
+            SELECT name, description FROM hits
+            GROUP BY name, description
+            ORDER BY MIN(score)
+            LIMIT ? OFFSET ?
+        """, (expression, -1 if limit is None else limit, offset))
+        return c.fetchall()
+
+    def like_search(self, query, limit=None, offset=0):
+        # Substring search over names, descriptions and tags; used without FTS5
         c = self.knowledge_base.cursor()
         c.execute("""
             SELECT DISTINCT c.name, c.description
@@ -355,25 +620,51 @@ class AIIdeationEngine:
             LEFT JOIN concept_tags ct ON c.id = ct.concept_id
             LEFT JOIN tags t ON ct.tag_id = t.id
             WHERE c.name LIKE ? OR c.description LIKE ? OR t.name LIKE ?
-        """, (f"%{query}%", f"%{query}%", f"%{query}%"))
+            LIMIT ? OFFSET ?
+        """, (f"%{query}%", f"%{query}%", f"%{query}%", -1 if limit is None else limit, offset))
         return c.fetchall()
 
-    def identify_synergies(self):
+    @track_processing_time
+    def count_concept_matches(self, queries, prefix=True):
+        # Number of concepts search_concepts would return for each query; the FTS
+        # queries are resolved in a single statement
+        queries = list(dict.fromkeys(queries))
+        expressions = {query: self.fts_query(query, prefix) for query in queries} if self.fts_enabled else {}
+        counts = {query: len(self.like_search(query)) for query in queries if expressions.get(query) is None}
+        fts_queries = [(query, expression) for query, expression in expressions.items() if expression is not None]
+        if not fts_queries:
+            return counts
+
         c = self.knowledge_base.cursor()
+        c.execute("CREATE TEMP TABLE IF NOT EXISTS fts_queries (query TEXT, expression TEXT)")
+        c.execute("DELETE FROM fts_queries")
+        c.executemany("INSERT INTO fts_queries (query, expression) VALUES (?, ?)", fts_queries)
         c.execute("""
-            SELECT c1.name, c2.name, COUNT(*) as common_tags
-            FROM concept_tags ct1
-            JOIN concept_tags ct2 ON ct1.tag_id = ct2.tag_id
-            JOIN concepts c1 ON ct1.concept_id = c1.id
-            JOIN concepts c2 ON ct2.concept_id = c2.id
-            WHERE c1.id < c2.id
-            GROUP BY c1.id, c2.id
-            HAVING common_tags > 1
-            ORDER BY common_tags DESC
-            LIMIT 10
+            SELECT q.query, COUNT(DISTINCT f.name || char(31) || f.description)
+            FROM fts_queries q JOIN concepts_fts f ON f.concepts_fts MATCH q.expression
+            GROUP BY q.query
         """)
-        return c.fetchall()
+        counts.update(dict.fromkeys((query for query, _ in fts_queries), 0))
+        counts.update(c.fetchall())
+        return {query: counts[query] for query in queries}
+
+    def get_synergy_index(self):
+        if self.synergy_index is None:
+            self.synergy_index = SynergyIndex.from_knowledge_base(self.knowledge_base)
+        return self.synergy_index
+
+    @track_processing_time
+    def identify_synergies(self, limit=10, metric="shared", max_tag_frequency=None):
+        # Top concept pairs by distinct shared tags (or Jaccard similarity), at least two
+        # shared tags, served from the incrementally maintained inverted tag index
+        pairs = self.get_synergy_index().top_pairs(limit, metric, max_tag_frequency=max_tag_frequency)
+        concept_ids = sorted({concept_id for a, b, _ in pairs for concept_id in (a, b)})
+        c = self.knowledge_base.cursor()
+        c.execute(f"SELECT id, name FROM concepts WHERE id IN ({', '.join('?' * len(concept_ids))})", concept_ids)
+        names = dict(c.fetchall())
+        return [(names.get(a), names.get(b), score) for a, b, score in pairs]
 
+    @track_processing_time
     def generate_report(self):
         report = "AI Ideation Engine Report\n"
         report += "==========================\n\n"
@@ -398,7 +689,7 @@ class AIIdeationEngine:
         
         # Top synergies
         report += "Top Concept Synergies:\n"
-        for concept1, concept2, common_tags in self.identify_synergies()[:5]:
+        for concept1, concept2, common_tags in self.identify_synergies(5):
             report += f"- {concept1} + {concept2} ({common_tags} common tags)\n"
         
         return report
@@ -412,40 +703,44 @@ class AIIdeationEngine:
     def connect_to_cartographer_of_light(self, api_endpoint):
         self.cartographer_of_light = api_endpoint
 
+    @track_processing_time
+    def fetch_integration_json(self, url, description, system_name, etag=None):
+        headers = {"If-None-Match": etag} if etag else {}
+        try:
+            # Also runs on the cache's background refresh thread, so it must not hang
+            response = requests.get(url, headers=headers, timeout=self.integration_options.get("timeout", 10.0))
+            if response.status_code == 304:
+                return NOT_MODIFIED, etag
+            if response.status_code == 200:
+                return response.json(), response.headers.get("ETag")
+            else:
+                print(f"Error fetching {description}: {response.status_code}")
+        except requests.RequestException as e:
+            print(f"Error connecting to {system_name}: {e}")
+        return None, None
+
+    def cached_integration_get(self, url, description, system_name):
+        if self.integration_cache is None:
+            return self.fetch_integration_json(url, description, system_name)[0]
+        return self.integration_cache.get(url, lambda etag: self.fetch_integration_json(url, description, system_name, etag))
+
+    def configure_integration_cache(self, ttl=60, stale_ttl=3600, snapshot_path=None):
+        # ttl=None disables caching of trends, needs and layout
+        self.integration_cache = None if ttl is None else IntegrationReadCache(ttl, stale_ttl, snapshot_path)
+
     def get_cultural_trends(self):
         if self.cultural_evolution_simulator:
-            try:
-                response = requests.get(f"{self.cultural_evolution_simulator}/trends")
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"Error fetching cultural trends: {response.status_code}")
-            except requests.RequestException as e:
-                print(f"Error connecting to Cultural Evolution Simulator: {e}")
+            return self.cached_integration_get(f"{self.cultural_evolution_simulator}/trends", "cultural trends", "Cultural Evolution Simulator")
         return None
 
     def get_community_needs(self):
         if self.community_cohesion_network:
-            try:
-                response = requests.get(f"{self.community_cohesion_network}/needs")
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"Error fetching community needs: {response.status_code}")
-            except requests.RequestException as e:
-                print(f"Error connecting to Community Cohesion Network: {e}")
+            return self.cached_integration_get(f"{self.community_cohesion_network}/needs", "community needs", "Community Cohesion Network")
         return None
 
     def get_city_layout(self):
         if self.cartographer_of_light:
-            try:
-                response = requests.get(f"{self.cartographer_of_light}/layout")
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"Error fetching city layout: {response.status_code}")
-            except requests.RequestException as e:
-                print(f"Error connecting to Cartographer of Light: {e}")
+            return self.cached_integration_get(f"{self.cartographer_of_light}/layout", "city layout", "Cartographer of Light")
         return None
 
     def generate_integrated_ideas(self):
@@ -465,51 +760,71 @@ class AIIdeationEngine:
 
         return integrated_ideas
 
+    def submit_idea(self, idea, submission):
+        # One submission ("cultural_impact", "community_feedback" or "spatial_analysis")
+        # for one idea, sent through the pooled client with the configured timeout and
+        # retries; None if the system is not connected or the request fails
+        system, _ = SUBMISSIONS[submission]
+        if not getattr(self, system):
+            return None
+        return self.submit_ideas_concurrently([idea], [submission])[0][submission]
+
     def submit_idea_for_cultural_impact_assessment(self, idea):
-        if self.cultural_evolution_simulator:
-            try:
-                response = requests.post(f"{self.cultural_evolution_simulator}/assess_impact", json={"idea": idea})
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"Error submitting idea for cultural impact assessment: {response.status_code}")
-            except requests.RequestException as e:
-                print(f"Error connecting to Cultural Evolution Simulator: {e}")
-        return None
+        return self.submit_idea(idea, "cultural_impact")
 
     def submit_idea_for_community_feedback(self, idea):
-        if self.community_cohesion_network:
-            try:
-                response = requests.post(f"{self.community_cohesion_network}/get_feedback", json={"idea": idea})
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"Error submitting idea for community feedback: {response.status_code}")
-            except requests.RequestException as e:
-                print(f"Error connecting to Community Cohesion Network: {e}")
-        return None
+        return self.submit_idea(idea, "community_feedback")
 
     def submit_idea_for_spatial_analysis(self, idea):
-        if self.cartographer_of_light:
-            try:
-                response = requests.post(f"{self.cartographer_of_light}/analyze_spatial_impact", json={"idea": idea})
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"Error submitting idea for spatial analysis: {response.status_code}")
-            except requests.RequestException as e:
-                print(f"Error connecting to Cartographer of Light: {e}")
-        return None
+        return self.submit_idea(idea, "spatial_analysis")
+
+    def integration_client(self, **options):
+        endpoints = {
+            "cultural_evolution_simulator": self.cultural_evolution_simulator,
+            "community_cohesion_network": self.community_cohesion_network,
+            "cartographer_of_light": self.cartographer_of_light
+        }
+        return AsyncIntegrationClient(endpoints, **{**self.integration_options, **options})
+
+    async def submit_ideas_async(self, ideas, submissions=None):
+        # Runs the cultural, community and spatial submissions for all ideas at once;
+        # for callers already running an event loop
+        async with self.integration_client() as client:
+            return await client.submit_ideas(ideas, submissions)
+
+    @track_processing_time
+    def submit_ideas_concurrently(self, ideas, submissions=None):
+        return asyncio.run(self.submit_ideas_async(ideas, submissions))
+
+    @track_processing_time
+    def submit_ideas_in_bulk(self, ideas, submissions=None, chunk_size=100, max_in_flight=4):
+        # Sends ideas in chunks to the batch routes, falling back to concurrent single
+        # requests for endpoints without batch support
+        async def submit():
+            async with self.integration_client() as client:
+                return await client.submit_ideas_bulk(ideas, submissions, chunk_size, max_in_flight)
+
+        return asyncio.run(submit())
+
+    def submit_ideas_for_cultural_impact_assessment(self, ideas, chunk_size=100):
+        return [result["cultural_impact"] for result in self.submit_ideas_in_bulk(ideas, ["cultural_impact"], chunk_size)]
 
+    def submit_ideas_for_community_feedback(self, ideas, chunk_size=100):
+        return [result["community_feedback"] for result in self.submit_ideas_in_bulk(ideas, ["community_feedback"], chunk_size)]
+
+    def submit_ideas_for_spatial_analysis(self, ideas, chunk_size=100):
+        return [result["spatial_analysis"] for result in self.submit_ideas_in_bulk(ideas, ["spatial_analysis"], chunk_size)]
+
+    @track_processing_time
     def conduct_ethical_review(self, concept):
-        spec = self.develop_specification(concept)
+        spec = self.get_specification(concept)
         ethical_score = self.assess_ethical_feasibility(spec)
         review_comments = []
         
         for board_member in self.ethical_review_board:
             review_comments.append(self.generate_ethical_feedback(board_member, spec))
         
-        approval_status = "Approved" if ethical_score > 0.7 else "Needs Revision"
+        approval_status = self.approval_status(ethical_score)
         
         c = self.knowledge_base.cursor()
         c.execute("INSERT INTO ethical_reviews (concept_id, review_text, approval_status) VALUES (?, ?, ?)",
@@ -522,8 +837,14 @@ class AIIdeationEngine:
             "approval_status": approval_status
         }
 
+    def approval_status(self, ethical_score):
+        return "Approved" if ethical_score > 0.7 else "Needs Revision"
+
     def update_ethical_guidelines(self, new_guidelines):
         self.ethical_guidelines.update(new_guidelines)
+        self.guideline_matcher = GuidelineMatcher(self.ethical_guidelines)
+        # Cached specs drew their ethical considerations from the old guidelines
+        self.spec_cache.invalidate()
         # In a real implementation, you would also update this in a persistent storage
 
     def check_diversity_in_ideation(self):
@@ -539,11 +860,27 @@ class AIIdeationEngine:
             "tag_distribution": dict(tag_distribution)
         }
 
+    @track_processing_time
     def generate_ethical_impact_report(self, concept):
-        spec = self.develop_specification(concept)
+        # Only starts an event loop when there are integration endpoints to ask
+        submissions = None
+        if self.integration_client().endpoints:
+            submissions = self.submit_ideas_concurrently([concept], IMPACT_REPORT_SUBMISSIONS)[0]
+        return self.format_ethical_impact_report(concept, submissions)
+
+    async def generate_ethical_impact_report_async(self, concept):
+        # Variant of generate_ethical_impact_report for callers inside a running event loop
+        submissions = None
+        if self.integration_client().endpoints:
+            submissions = (await self.submit_ideas_async([concept], IMPACT_REPORT_SUBMISSIONS))[0]
+        return self.format_ethical_impact_report(concept, submissions)
+
+    def format_ethical_impact_report(self, concept, submissions=None):
+        spec = self.get_specification(concept)
         ethical_review = self.conduct_ethical_review(concept)
-        cultural_impact = self.submit_idea_for_cultural_impact_assessment(concept)
-        community_feedback = self.submit_idea_for_community_feedback(concept)
+        submissions = submissions or {}
+        cultural_impact = submissions.get("cultural_impact")
+        community_feedback = submissions.get("community_feedback")
         
         report = f"Ethical Impact Report for: {concept}\n\n"
         report += f"Ethical Score: {ethical_review['ethical_score']:.2f}\n"
@@ -575,11 +912,11 @@ class AIIdeationEngine:
             self.performance_metrics["ethical_reviews_conducted"] += 1
         if feasibility_score is not None:
             current_avg = self.performance_metrics["average_feasibility_score"]
-            total_ideas = self.performance_metrics["ideas_generated"]
+            total_ideas = max(self.performance_metrics["ideas_generated"], 1)
             self.performance_metrics["average_feasibility_score"] = (current_avg * (total_ideas - 1) + feasibility_score) / total_ideas
         if impact_score is not None:
             current_avg = self.performance_metrics["average_impact_score"]
-            total_ideas = self.performance_metrics["ideas_generated"]
+            total_ideas = max(self.performance_metrics["ideas_generated"], 1)
             self.performance_metrics["average_impact_score"] = (current_avg * (total_ideas - 1) + impact_score) / total_ideas
         
     def calculate_diversity_score(self):
@@ -589,55 +926,6 @@ class AIIdeationEngine:
         total_concepts = len(self.concepts)
         self.performance_metrics["diversity_score"] = unique_concepts / total_concepts if total_concepts > 0 else 0
 
-    def track_processing_time(func):
-        def wrapper(self, *args, **kwargs):
-            start_time = time.time()
-            result = func(self, *args, **kwargs)
-            end_time = time.time()
-            self.performance_metrics["processing_time"] += end_time - start_time
-            return result
-        return wrapper
-
-    @track_processing_time
-    def generate_ideas(self, num_ideas=5):
-        ideas = []
-        for _ in range(num_ideas):
-            concept_combo = random.sample(self.concepts, 2)
-            challenge = random.choice(self.challenges)
-            idea = f"A {concept_combo[0]} system that uses {concept_combo[1]} to address {challenge} in the Cities of Light"
-            ideas.append(idea)
-        self.update_performance_metrics(new_idea=True)
-        return ideas
-
-    @track_processing_time
-    def develop_specification(self, concept):
-        # Existing implementation
-        spec = super().develop_specification(concept)
-        self.update_performance_metrics(concept_refined=True)
-        return spec
-
-    @track_processing_time
-    def conduct_ethical_review(self, concept):
-        # Existing implementation
-        review = super().conduct_ethical_review(concept)
-        self.update_performance_metrics(ethical_review=True)
-        return review
-
-    @track_processing_time
-    def assess_feasibility(self, concept):
-        # Existing implementation
-        feasibility = super().assess_feasibility(concept)
-        self.update_performance_metrics(feasibility_score=feasibility)
-        return feasibility
-
-    @track_processing_time
-    def estimate_impact(self, concept):
-        # Existing implementation
-        impact = super().estimate_impact(concept)
-        self.update_performance_metrics(impact_score=impact)
-        return impact
-import numpy as np
-from sklearn.cluster import KMeans
 
 class ContinuousImprovementModule:
     def __init__(self, ai_ideation_engine):
@@ -646,6 +934,8 @@ class ContinuousImprovementModule:
         self.learning_rate = 0.1
 
     def evaluate_performance(self):
+        import numpy as np
+
         return np.mean([
             self.engine.performance_metrics["average_feasibility_score"],
             self.engine.performance_metrics["average_impact_score"],
@@ -668,6 +958,9 @@ class ContinuousImprovementModule:
         idea_vectors = self.vectorize_ideas(ideas)
         
         # Use K-means clustering to identify underexplored areas
+        import numpy as np
+        from sklearn.cluster import KMeans
+
         kmeans = KMeans(n_clusters=3)
         clusters = kmeans.fit_predict(idea_vectors)
         
@@ -1467,15 +1760,6 @@ class EnhancedAIIdeationEngine(AIIdeationEngine):
         total_concepts = len(self.concepts)
         self.performance_metrics["diversity_score"] = unique_concepts / total_concepts if total_concepts > 0 else 0
 
-    def track_processing_time(func):
-        def wrapper(self, *args, **kwargs):
-            start_time = time.time()
-            result = func(self, *args, **kwargs)
-            end_time = time.time()
-            self.performance_metrics["processing_time"] += end_time - start_time
-            return result
-        return wrapper
-
     @track_processing_time
     def generate_ideas(self, num_ideas=5):
         # Existing implementation
@@ -1510,22 +1794,46 @@ class EnhancedAIIdeationEngine(AIIdeationEngine):
         impact = super().estimate_impact(concept)
         self.update_performance_metrics(impact_score=impact)
         return impact
-import numpy as np
-from sklearn.cluster import KMeans
 
 class ContinuousImprovementModule:
-    def __init__(self, ai_ideation_engine):
+    # cluster_state_path opts in to persisting the idea clusters between runs
+    def __init__(self, ai_ideation_engine, cluster_state_path=None):
         self.engine = ai_ideation_engine
         self.improvement_history = []
         self.learning_rate = 0.1
+        self.cluster_state_path = cluster_state_path
+        self._vectorizer = None
+        self._clusterer = None
+
+    # The vectorizer and clusterer pull in NumPy, SciPy and scikit-learn, so they are
+    # imported and built on first use rather than when the engine starts
+    @property
+    def vectorizer(self):
+        if self._vectorizer is None:
+            from idea_vectorizer import IdeaVectorizer
+
+            self._vectorizer = IdeaVectorizer()
+        return self._vectorizer
+
+    @property
+    def clusterer(self):
+        if self._clusterer is None:
+            from idea_clusterer import IdeaClusterer
 
+            self._clusterer = IdeaClusterer.load_or_create(self.cluster_state_path)
+        return self._clusterer
+
+    @instrumentation.timed()
     def evaluate_performance(self):
+        import numpy as np
+
         return np.mean([
             self.engine.performance_metrics["average_feasibility_score"],
             self.engine.performance_metrics["average_impact_score"],
             self.engine.performance_metrics["diversity_score"]
         ])
 
+    @instrumentation.timed()
     def suggest_improvements(self):
         current_performance = self.evaluate_performance()
         self.improvement_history.append(current_performance)
@@ -1539,23 +1847,22 @@ class ContinuousImprovementModule:
 
         # Analyze generated ideas to identify areas for improvement
         ideas = [idea for idea in self.engine.generate_ideas(10)]
-        idea_vectors = self.vectorize_ideas(ideas)
-        
-        # Use K-means clustering to identify underexplored areas
-        kmeans = KMeans(n_clusters=3)
-        clusters = kmeans.fit_predict(idea_vectors)
         
-        cluster_sizes = np.bincount(clusters)
-        underexplored_cluster = np.argmin(cluster_sizes)
+        # Fold the new ideas into the persistent clustering of every idea seen so far
+        # and pick the cluster with the fewest ideas as the underexplored area
+        self.clusterer.partial_fit(ideas)
+        if self.cluster_state_path:
+            self.clusterer.save(self.cluster_state_path)
+        underexplored_cluster = self.clusterer.underexplored_cluster()
         
         return f"Focus on exploring ideas similar to cluster {underexplored_cluster}"
 
     def vectorize_ideas(self, ideas):
-        # Simple vectorization based on word frequency
-        # In a real implementation, you might use more sophisticated NLP techniques
-        all_words = set(word for idea in ideas for word in idea.split())
-        return [[idea.split().count(word) for word in all_words] for idea in ideas]
+        # Word counts over the vectorizer's persistent vocabulary, so columns keep
+        # their meaning from one improvement cycle to the next
+        return self.vectorizer.transform(ideas)
 
+    @instrumentation.timed()
     def update_knowledge_base(self):
         # Implement logic to update the knowledge base
         # This could involve adding new concepts, updating existing ones, or removing outdated information
@@ -1564,7 +1871,7 @@ class ContinuousImprovementModule:
         
         # Remove least used concepts if the knowledge base gets too large
         if len(self.engine.concepts) > 100:
-            concept_usage = {concept: self.engine.search_concepts(concept) for concept in self.engine.concepts}
+            concept_usage = self.engine.count_concept_matches(self.engine.concepts)
             least_used = sorted(concept_usage, key=concept_usage.get)[:5]
             for concept in least_used:
                 self.engine.concepts.remove(concept)
@@ -1577,6 +1884,7 @@ class ContinuousImprovementModule:
             self.engine.update_ethical_guidelines({"practicality": "Prioritize practical and implementable ideas"})
         # Add more conditions based on possible feedback
 
+    @instrumentation.timed()
     def run_improvement_cycle(self):
         suggestion = self.suggest_improvements()
         self.update_knowledge_base()
@@ -1584,19 +1892,64 @@ class ContinuousImprovementModule:
         return suggestion
 
 class EnhancedAIIdeationEngine(AIIdeationEngine):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, spec_seed=None, spec_cache_size=1024, db_path='knowledge_base.db'):
+        super().__init__(spec_seed=spec_seed, spec_cache_size=spec_cache_size, db_path=db_path)
         self.continuous_improvement = ContinuousImprovementModule(self)
         self.current_phase = 1
         self.idea_feedback = {}
 
     def initialize_knowledge_base(self):
-        # Initialize the knowledge base with some default data
-        return {
-            "AI concepts": ["machine learning", "neural networks", "deep learning", "natural language processing"],
-            "City challenges": ["traffic congestion", "energy efficiency", "waste management", "public safety"],
-            "Emerging technologies": ["blockchain", "quantum computing", "Internet of Things", "augmented reality"]
-        }
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        
+        # Create tables if they don't exist
+        c.execute('''CREATE TABLE IF NOT EXISTS concepts
+                     (id INTEGER PRIMARY KEY, name TEXT, description TEXT)''')
+        c.execute('''CREATE TABLE IF NOT EXISTS specifications
+                     (id INTEGER PRIMARY KEY, concept_id INTEGER, spec_json TEXT,
+                      FOREIGN KEY(concept_id) REFERENCES concepts(id))''')
+        c.execute('''CREATE TABLE IF NOT EXISTS tags
+                     (id INTEGER PRIMARY KEY, name TEXT)''')
+        c.execute('''CREATE TABLE IF NOT EXISTS concept_tags
+                     (concept_id INTEGER, tag_id INTEGER,
+                      FOREIGN KEY(concept_id) REFERENCES concepts(id),
+                      FOREIGN KEY(tag_id) REFERENCES tags(id))''')
+        c.execute('''CREATE TABLE IF NOT EXISTS ethical_reviews
+                     (id INTEGER PRIMARY KEY, concept_id INTEGER, review_text TEXT, approval_status TEXT,
+                      FOREIGN KEY(concept_id) REFERENCES concepts(id))''')
+        
+        # Older databases may hold duplicate tag names; merge them before adding the unique index
+        c.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_tags_name'")
+        if c.fetchone() is None:
+            c.execute('''UPDATE concept_tags SET tag_id =
+                         (SELECT MIN(t2.id) FROM tags t1 JOIN tags t2 ON t1.name = t2.name
+                          WHERE t1.id = concept_tags.tag_id)
+                         WHERE tag_id IN (SELECT id FROM tags)''')
+            c.execute("DELETE FROM tags WHERE id NOT IN (SELECT MIN(id) FROM tags GROUP BY name)")
+        c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_tags_name ON tags(name)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_concept_tags_concept ON concept_tags(concept_id)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_concept_tags_tag ON concept_tags(tag_id)")
+        self.spec_store = SpecStore(conn)
+        self.spec_store.ensure_schema()
+        
+        # Full-text index over names, descriptions and tags (rowid = concepts.id);
+        # rows missing from older databases are backfilled here
+        try:
+            c.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS concepts_fts
+                         USING fts5(name, description, tags, prefix='2 3')""")
+            c.execute("""INSERT INTO concepts_fts (rowid, name, description, tags)
+                         SELECT c.id, c.name, c.description,
+                                (SELECT group_concat(t.name, ' ') FROM concept_tags ct
+                                 JOIN tags t ON ct.tag_id = t.id WHERE ct.concept_id = c.id)
+                         FROM concepts c
+                         WHERE c.id > (SELECT COALESCE(MAX(rowid), 0) FROM concepts_fts)""")
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable, falling back to LIKE queries: {e}")
+            self.fts_enabled = False
+        
+        conn.commit()
+        return conn
 
     def load_ethical_guidelines(self):
         # In a real implementation, this would load from a file or database
@@ -1647,18 +2000,33 @@ class EnhancedAIIdeationEngine(AIIdeationEngine):
 
         return analysis
 
-    def generate_ideas(self, num_ideas=5):
-        ideas = []
-        for _ in range(num_ideas):
-            concept_combo = random.sample(self.concepts, 2)
-            challenge = random.choice(self.challenges)
-            idea = f"A {concept_combo[0]} system that uses {concept_combo[1]} to address {challenge} in the Cities of Light"
-            ideas.append(idea)
-        self.update_performance_metrics(new_idea=True)
-        return ideas
+    @track_processing_time
+    def develop_specification(self, concept):
+        # Existing implementation
+        spec = super().develop_specification(concept)
+        self.update_performance_metrics(concept_refined=True)
+        return spec
 
-    def run_continuous_improvement(self):
-        return self.continuous_improvement.run_improvement_cycle()
+    @track_processing_time
+    def conduct_ethical_review(self, concept):
+        # Existing implementation
+        review = super().conduct_ethical_review(concept)
+        self.update_performance_metrics(ethical_review=True)
+        return review
+
+    @track_processing_time
+    def assess_feasibility(self, concept):
+        # Existing implementation
+        feasibility = super().assess_feasibility(concept)
+        self.update_performance_metrics(feasibility_score=feasibility)
+        return feasibility
+
+    @track_processing_time
+    def estimate_impact(self, concept):
+        # Existing implementation
+        impact = super().estimate_impact(concept)
+        self.update_performance_metrics(impact_score=impact)
+        return impact
 
     def generate_ideas(self, num_ideas=5):
         ideas = super().generate_ideas(num_ideas)
@@ -1692,7 +2060,7 @@ class EnhancedAIIdeationEngine(AIIdeationEngine):
             # Run a full idea generation cycle
             ideas = self.generate_ideas(5)
             for idea in ideas:
-                spec = self.develop_specification(idea)
+                spec = self.get_specification(idea)
                 feasibility = self.assess_feasibility(idea)
                 impact = self.estimate_impact(idea)
                 self.refine_concept(idea)
@@ -0,0 +1,68 @@
+import numpy as np
+
+# Batch form of the engine's per-spec scoring (assess_technical_feasibility,
+# assess_resource_feasibility, assess_ethical_feasibility, assess_feasibility and
+# estimate_impact). Every operation mirrors the scalar code in the same order, so
+# the float64 results are bit-for-bit identical.
+
+COUNT_FIELDS = ("key_features", "integration_points", "potential_challenges",
+                "required_resources", "ethical_considerations")
+
+
+def accumulated_steps(count, step=0.2):
+    # The scalar path adds `step` once per keyword hit, and repeated float addition
+    # differs from count * step (0.2 + 0.2 + 0.2 != 0.6), so the sums are tabulated
+    table = np.empty(count + 1)
+    total = 0
+    for hits in range(count + 1):
+        table[hits] = total
+        total += step
+    return table
+
+
+def count_matrix(specs):
+    # (len(specs), len(COUNT_FIELDS)) matrix of list lengths
+    lengths = (len(spec[field]) for spec in specs for field in COUNT_FIELDS)
+    return np.fromiter(lengths, dtype=np.int64, count=len(specs) * len(COUNT_FIELDS)).reshape(-1, len(COUNT_FIELDS))
+
+
+def guideline_hits(specs, counts, matcher):
+    # Number of guideline hits per spec. Considerations repeat the same guideline text
+    # across specs, so each consideration is mapped to the index of its distinct
+    # text and the matcher only runs once per distinct text.
+    distinct = {}
+    codes = np.fromiter(
+        (distinct.setdefault(text, len(distinct)) for spec in specs for text in spec["ethical_considerations"]),
+        dtype=np.int64, count=int(counts.sum())
+    )
+    hits = np.fromiter((matcher.count(text) for text in distinct), dtype=np.int64, count=len(distinct))
+    owners = np.repeat(np.arange(len(specs)), counts)
+    return np.bincount(owners, weights=hits[codes], minlength=len(specs)).astype(np.int64)
+
+
+def score_specs(specs, matcher):
+    # matcher is the engine's GuidelineMatcher
+    specs = list(specs)
+    counts = count_matrix(specs)
+    features, integrations, challenges, resources, considerations = counts.T
+
+    technical = 1.0 - (features * 0.1 + integrations * 0.05 + challenges * 0.15)
+    technical = np.clip(technical, 0.0, 1.0)
+
+    resource = np.clip(1.0 - resources * 0.2, 0.0, 1.0)
+
+    hits = guideline_hits(specs, considerations, matcher)
+    ethical = np.minimum(1.0, accumulated_steps(int(hits.max(initial=0)))[hits])
+
+    feasibility = np.clip((technical + resource + ethical) / 3, 0.0, 1.0)
+
+    impact = features * 0.2 + integrations * 0.15 + considerations * 0.1
+    impact = np.clip(impact, 0.0, 1.0)
+
+    return {
+        "technical_feasibility": technical,
+        "resource_feasibility": resource,
+        "ethical_feasibility": ethical,
+        "feasibility": feasibility,
+        "impact": impact
+    }
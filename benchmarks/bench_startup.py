@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Cold-start benchmark for the main.py entry point and the engine constructor.
+# Every measurement runs in a fresh interpreter so nothing is already imported.
+#
+#   python benchmarks/bench_startup.py
+#   python benchmarks/bench_startup.py --repeat 10 --import-budget-ms 300 --json startup.json
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that must only be imported on first use
+HEAVY_MODULES = ["numpy", "scipy", "sklearn", "httpx", "PyPDF2", "openai"]
+
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from ai_ideation_engine import EnhancedAIIdeationEngine
+EnhancedAIIdeationEngine(db_path=":memory:")
+constructed = time.perf_counter()
+from system.research_coordinator import ResearchCoordinator
+ResearchCoordinator()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "construct_ms": (constructed - imported) * 1000,
+    "heavy_modules": [name for name in %r if name in sys.modules]
+}))
+""" % HEAVY_MODULES
+
+
+def run_python(args, cwd):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run([sys.executable] + args, cwd=cwd, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup script failed:\n{result.stderr}")
+    return result
+
+
+def import_profile(cwd):
+    # Parses "import time: self [us] | cumulative | package" lines from -X importtime
+    result = run_python(["-X", "importtime", "-c", "import main"], cwd)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((int(self_us), int(cumulative_us), name.strip()))
+    return modules
+
+
+def measure(repeat, cwd):
+    runs = [json.loads(run_python(["-c", STARTUP_SCRIPT], cwd).stdout) for _ in range(repeat)]
+    return {
+        "import_ms": statistics.median(run["import_ms"] for run in runs),
+        "construct_ms": statistics.median(run["construct_ms"] for run in runs),
+        "heavy_modules": sorted({name for run in runs for name in run["heavy_modules"]})
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start latency of main.py and the engine constructor.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to start (median is reported)")
+    parser.add_argument("--import-budget-ms", type=float, default=400.0, help="Budget for importing main.py")
+    parser.add_argument("--construct-budget-ms", type=float, default=200.0, help="Budget for EnhancedAIIdeationEngine()")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    # Run from an empty directory so the constructor cannot touch the repository's files
+    with tempfile.TemporaryDirectory() as cwd:
+        profile = import_profile(cwd)
+        results = measure(args.repeat, cwd)
+
+    print(f"import main:               {results['import_ms']:8.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    print(f"EnhancedAIIdeationEngine(): {results['construct_ms']:7.1f} ms (budget {args.construct_budget_ms:.0f} ms)")
+    print("Slowest imports (cumulative, from -X importtime):")
+    for self_us, cumulative_us, name in sorted(profile, key=lambda module: module[1], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if results["import_ms"] > args.import_budget_ms:
+        failures.append(f"importing main.py took {results['import_ms']:.1f} ms")
+    if results["construct_ms"] > args.construct_budget_ms:
+        failures.append(f"constructing the engine took {results['construct_ms']:.1f} ms")
+    if results["heavy_modules"]:
+        failures.append(f"heavy modules imported at startup: {', '.join(results['heavy_modules'])}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(dict(results, profile=profile, failures=failures), f, indent=2)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
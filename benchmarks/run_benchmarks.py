@@ -0,0 +1,293 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Benchmarks for the ideation engine's hot paths, run against a seeded synthetic
+# knowledge base at each corpus size. Integration calls go to the local stub.
+# Results can be saved as JSON and compared against an earlier run:
+#
+#   python benchmarks/run_benchmarks.py --sizes 1000,100000 --json before.json
+#   python benchmarks/run_benchmarks.py --sizes 1000,100000 --compare before.json
+#   python benchmarks/run_benchmarks.py --sizes 1000000 --bench search,synergies
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from ai_ideation_engine import EnhancedAIIdeationEngine  # noqa: E402
+from instrumentation import instrumentation  # noqa: E402
+from integration_stub import start_stub_server, connect_engine_to_stub  # noqa: E402
+from spec_sink import open_spec_sink  # noqa: E402
+
+SEARCH_QUERIES = ["quantum", "energy efficiency", "neural networks", "privacy", "blockchain system",
+                  "virtual reality", "robotics to address", "human-AI", "ethical", "Cities of Light"]
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    # Registers setup(corpus) -> (run, operations_per_run)
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class Corpus:
+    # Engine backed by a knowledge base of `size` synthetic concepts. Concept names
+    # are unique, and specifications come from develop_specification with spec_seed
+    # so the same seed and size always produce the same data.
+    def __init__(self, size, seed, sample, directory):
+        self.size = size
+        self.seed = seed
+        self.sample_size = min(size, sample)
+        self.directory = directory
+        random.seed(seed)
+        self.engine = EnhancedAIIdeationEngine(
+            spec_seed=seed, db_path=os.path.join(directory, f"bench_{size}.db")
+        )
+        self.names = []
+        self.added = 0
+        self.fill()
+        self.sample = random.Random(seed).sample(self.names, self.sample_size)
+
+    def concept_name(self, index):
+        return f"{self.engine.generate_ideas(1)[0]} #{index}"
+
+    def fill(self, chunk_size=10000):
+        for start in range(0, self.size, chunk_size):
+            chunk = [self.concept_name(index) for index in range(start, min(start + chunk_size, self.size))]
+            self.engine.add_concepts_bulk([(name, self.engine.develop_specification(name)) for name in chunk])
+            self.names.extend(chunk)
+
+    def new_concepts(self, count):
+        names = [self.concept_name(f"new-{self.added + index}") for index in range(count)]
+        self.added += count
+        return names
+
+
+@benchmark("generate_ideas")
+def bench_generate_ideas(corpus):
+    count = corpus.sample_size
+    return lambda: corpus.engine.generate_ideas(count), count
+
+
+@benchmark("develop_specification")
+def bench_develop_specification(corpus):
+    def run():
+        for concept in corpus.sample:
+            corpus.engine.develop_specification(concept)
+    return run, corpus.sample_size
+
+
+@benchmark("assess_feasibility")
+def bench_assess_feasibility(corpus):
+    def run():
+        for concept in corpus.sample:
+            corpus.engine.assess_feasibility(concept)
+    return run, corpus.sample_size
+
+
+@benchmark("assess_ethical_feasibility")
+def bench_assess_ethical_feasibility(corpus):
+    specs = [corpus.engine.get_specification(concept) for concept in corpus.sample]
+
+    def run():
+        for spec in specs:
+            corpus.engine.assess_ethical_feasibility(spec)
+    return run, len(specs)
+
+
+@benchmark("refine_concept")
+def bench_refine_concept(corpus):
+    def run():
+        for concept in corpus.sample:
+            corpus.engine.refine_concept(concept)
+    return run, corpus.sample_size
+
+
+@benchmark("refine_concepts")
+def bench_refine_concepts(corpus):
+    def run():
+        corpus.engine.refine_concepts(corpus.sample, max_workers=4)
+    return run, corpus.sample_size
+
+
+@benchmark("search_concepts")
+def bench_search_concepts(corpus):
+    def run():
+        for query in SEARCH_QUERIES:
+            corpus.engine.search_concepts(query, limit=10)
+    return run, len(SEARCH_QUERIES)
+
+
+@benchmark("identify_synergies")
+def bench_identify_synergies(corpus):
+    return lambda: corpus.engine.identify_synergies(), 1
+
+
+@benchmark("check_diversity_in_ideation")
+def bench_check_diversity(corpus):
+    return lambda: corpus.engine.check_diversity_in_ideation(), 1
+
+
+@benchmark("run_improvement_cycle")
+def bench_improvement_cycle(corpus):
+    return lambda: corpus.engine.continuous_improvement.run_improvement_cycle(), 1
+
+
+@benchmark("submit_ideas_in_bulk")
+def bench_submit_ideas(corpus):
+    ideas = corpus.sample[:500]
+    return lambda: corpus.engine.submit_ideas_in_bulk(ideas), len(ideas)
+
+
+def spec_writer(corpus, format):
+    specs = [(concept, corpus.engine.get_specification(concept)) for concept in corpus.sample]
+    directory = tempfile.mkdtemp(prefix=f"specs_{format}_", dir=corpus.directory)
+
+    def run():
+        sink = open_spec_sink(directory, format)
+        for concept, spec in specs:
+            sink.write(concept, spec)
+        sink.close()
+    return run, len(specs)
+
+
+@benchmark("save_spec_files")
+def bench_save_spec_files(corpus):
+    return spec_writer(corpus, "files")
+
+
+@benchmark("save_spec_segments")
+def bench_save_spec_segments(corpus):
+    return spec_writer(corpus, "segments")
+
+
+@benchmark("add_concept_to_knowledge_base")
+def bench_add_concept(corpus):
+    # Runs last among the knowledge base benchmarks because it grows the corpus
+    count = min(corpus.sample_size, 200)
+
+    def run():
+        for concept in corpus.new_concepts(count):
+            corpus.engine.add_concept_to_knowledge_base(concept, corpus.engine.develop_specification(concept))
+    return run, count
+
+
+def measure(run, operations, repeat):
+    run()  # warm up caches and lazily built indexes
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        "operations": operations,
+        "median_s": median,
+        "min_s": min(timings),
+        "ops_per_s": operations / median if median else float("inf"),
+        "peak_kb": peak / 1024
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path) as f:
+        baseline = {(r["benchmark"], r["size"]): r for r in json.load(f)["results"]}
+    regressions = []
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        before = baseline.get((result["benchmark"], result["size"]))
+        if before is None:
+            continue
+        speed = result["ops_per_s"] / before["ops_per_s"] - 1
+        memory = result["peak_kb"] / before["peak_kb"] - 1 if before["peak_kb"] else 0
+        flag = ""
+        if speed < -threshold:
+            flag = "  REGRESSION"
+            regressions.append(result)
+        print(f"  {result['benchmark']:<30} {result['size']:>9}  throughput {speed:+7.1%}  peak memory {memory:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ideation engine's hot paths.")
+    parser.add_argument("--sizes", default="1000,100000", help="Comma separated corpus sizes, e.g. 1000,100000,1000000")
+    parser.add_argument("--bench", help="Comma separated substrings selecting benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (median is reported)")
+    parser.add_argument("--sample", type=int, default=1000, help="Concepts processed per run by per-concept benchmarks")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic corpus")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Baseline JSON file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Throughput drop counted as a regression")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    selected = [name for name in BENCHMARKS
+                if not args.bench or any(part in name for part in args.bench.split(","))]
+
+    # Measure the code paths themselves, not the span bookkeeping
+    instrumentation.configure(enabled=False)
+    server, url = start_stub_server()
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for size in sizes:
+                start = time.perf_counter()
+                corpus = Corpus(size, args.seed, args.sample, directory)
+                connect_engine_to_stub(corpus.engine, url)
+                print(f"Corpus of {size} concepts built in {time.perf_counter() - start:.1f}s")
+                for name in selected:
+                    run, operations = BENCHMARKS[name](corpus)
+                    result = dict(measure(run, operations, args.repeat), benchmark=name, size=size)
+                    results.append(result)
+                    print(f"  {name:<30} {result['ops_per_s']:>12.1f} ops/s  "
+                          f"{result['median_s'] * 1000:>10.2f} ms/run  {result['peak_kb']:>10.1f} KiB peak")
+                corpus.engine.knowledge_base.close()
+    finally:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "meta": {
+                    "commit": git_commit(),
+                    "python": platform.python_version(),
+                    "timestamp": time.time(),
+                    "seed": args.seed,
+                    "repeat": args.repeat,
+                    "sample": args.sample
+                },
+                "results": results
+            }, f, indent=2)
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import os
+import re
+import threading
+import time
+
+from specification import as_dict
+
+# Columnar copy of specifications and their scores, written as Parquet partitions
+# next to knowledge_base.db. Analyses read only the columns they need and
+# aggregate with Arrow compute kernels instead of parsing spec_json row by row.
+# pyarrow is imported on first use.
+
+LIST_COLUMNS = ("key_features", "required_resources", "potential_challenges",
+                "integration_points", "ethical_considerations")
+
+CHALLENGE_PATTERN = re.compile(r"address (.+?)(?: in the Cities of Light)?$")
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("The columnar store needs pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def challenge_of(concept):
+    match = CHALLENGE_PATTERN.search(concept)
+    return match.group(1) if match else None
+
+
+class ColumnarStore:
+    # Rows are buffered and written as one Parquet file per rows_per_partition
+    # records (and on flush), each file written to a temporary name and renamed
+    # into place so readers never see a partial partition.
+    def __init__(self, root="spec_columns", rows_per_partition=50000):
+        self.pa = require_pyarrow()
+        self.root = root
+        self.rows_per_partition = rows_per_partition
+        self.schema = self.build_schema()
+        self.rows = self.empty_buffer()
+        self.lock = threading.Lock()
+        self.sequence = 0
+        os.makedirs(root, exist_ok=True)
+
+    def build_schema(self):
+        pa = self.pa
+        text = pa.dictionary(pa.int32(), pa.string())
+        return pa.schema(
+            [("concept", pa.string()), ("challenge", text), ("purpose", pa.string())]
+            + [(column, pa.list_(pa.string())) for column in LIST_COLUMNS]
+            + [("feasibility", pa.float64()), ("impact", pa.float64()), ("ethical_score", pa.float64()),
+               ("approval_status", text), ("refined", pa.bool_()), ("recorded_at", pa.float64())]
+        )
+
+    def empty_buffer(self):
+        return {field.name: [] for field in self.schema}
+
+    def record(self, concept, spec, feasibility=None, impact=None, ethical_score=None,
+               approval_status=None, refined=False):
+        spec = as_dict(spec)
+        with self.lock:
+            rows = self.rows
+            rows["concept"].append(concept)
+            rows["challenge"].append(challenge_of(concept))
+            rows["purpose"].append(spec.get("purpose"))
+            for column in LIST_COLUMNS:
+                rows[column].append(spec.get(column))
+            rows["feasibility"].append(feasibility)
+            rows["impact"].append(impact)
+            rows["ethical_score"].append(ethical_score)
+            rows["approval_status"].append(approval_status)
+            rows["refined"].append(refined)
+            rows["recorded_at"].append(time.time())
+            full = len(rows["concept"]) >= self.rows_per_partition
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            rows, self.rows = self.rows, self.empty_buffer()
+            if not rows["concept"]:
+                return None
+            self.sequence += 1
+            name = f"part-{int(time.time() * 1000)}-{os.getpid()}-{self.sequence:05d}.parquet"
+        import pyarrow.parquet as pq
+
+        table = self.pa.Table.from_pydict(rows, schema=self.schema)
+        path = os.path.join(self.root, name)
+        temp_path = os.path.join(self.root, f".{name}.tmp")
+        pq.write_table(table, temp_path, compression="zstd")
+        os.replace(temp_path, path)
+        return path
+
+    def query(self):
+        return ColumnarQuery(self.root)
+
+
+class ColumnarQuery:
+    # Read-side helpers over every partition under root. Results are Arrow tables;
+    # call .to_pylist() or .to_pandas() on the (small) aggregated output.
+    def __init__(self, root="spec_columns"):
+        self.pa = require_pyarrow()
+        self.root = root
+
+    def dataset(self):
+        import pyarrow.dataset as ds
+
+        paths = sorted(
+            os.path.join(self.root, name) for name in os.listdir(self.root)
+            if name.endswith(".parquet") and not name.startswith(".")
+        )
+        return ds.dataset(paths, format="parquet")
+
+    def table(self, columns=None, filter=None):
+        return self.dataset().to_table(columns=columns, filter=filter)
+
+    def count(self):
+        return self.dataset().count_rows()
+
+    def aggregate(self, by, aggregations, filter=None):
+        # aggregations: list of (column, function), e.g. [("feasibility", "mean")]
+        by = [by] if isinstance(by, str) else list(by)
+        columns = list(dict.fromkeys(by + [column for column, _ in aggregations]))
+        table = self.table(columns=columns, filter=filter)
+        for column in by:
+            if self.pa.types.is_dictionary(table.schema.field(column).type):
+                table = table.set_column(table.schema.get_field_index(column), column,
+                                         table.column(column).cast(self.pa.string()))
+        return table.group_by(by).aggregate(aggregations)
+
+    def average_by(self, by, value="feasibility"):
+        return self.aggregate(by, [(value, "mean"), (value, "count")]).sort_by(f"{value}_mean")
+
+    def value_counts(self, list_column):
+        # How often each element of a list column (e.g. "required_resources") occurs
+        import pyarrow.compute as pc
+
+        values = pc.list_flatten(self.table(columns=[list_column]).column(list_column))
+        counts = pc.value_counts(values)
+        return self.pa.table({
+            list_column: counts.field("values"),
+            "count": counts.field("counts")
+        }).sort_by([("count", "descending")])
+
+    def cooccurrence(self, list_column="integration_points"):
+        # Counts each unordered pair of values appearing in the same spec, by
+        # self-joining the flattened (row, value) table on the row index
+        import pyarrow.compute as pc
+
+        column = self.table(columns=[list_column]).column(list_column).combine_chunks()
+        pairs = self.pa.table({
+            "row": pc.list_parent_indices(column),
+            "value": pc.list_flatten(column)
+        })
+        joined = pairs.join(pairs, keys="row", right_suffix="_other")
+        joined = joined.filter(pc.less(joined.column("value"), joined.column("value_other")))
+        counts = joined.group_by(["value", "value_other"]).aggregate([("row", "count_distinct")])
+        return self.pa.table({
+            "value": counts.column("value"),
+            "value_other": counts.column("value_other"),
+            "specs": counts.column("row_count_distinct")
+        }).sort_by([("specs", "descending")])
@@ -0,0 +1,25 @@
+def normalize(text):
+    return text.lower().replace("_", " ")
+
+
+class GuidelineMatcher:
+    # Finds which ethical guidelines a piece of text mentions. Guideline keys and
+    # the text are both lowercased with underscores read as spaces
+    # ("human_oversight" also matches "Human oversight"), so matching is one
+    # normalization of the text followed by a plain substring check per key, the
+    # same test the original keyword loop made. Keys that normalize to the same
+    # name count once.
+    def __init__(self, guidelines):
+        self.keys = {}
+        for key in guidelines:
+            self.keys.setdefault(normalize(key), key)
+        self.names = tuple(self.keys.items())
+
+    def hits(self, text):
+        # Set of guideline keys mentioned in text
+        text = normalize(text)
+        return {key for name, key in self.names if name in text}
+
+    def count(self, text):
+        text = normalize(text)
+        return sum(name in text for name, _ in self.names)
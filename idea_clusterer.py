@@ -0,0 +1,86 @@
+import os
+import pickle
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+from idea_vectorizer import IdeaVectorizer
+
+
+class IdeaClusterer:
+    # Streaming k-means over every idea seen so far. Ideas are hashed into a fixed
+    # number of features so the centroids never change shape, each batch updates
+    # the model with MiniBatchKMeans.partial_fit, and the per-cluster counts are
+    # kept so the least explored cluster is an argmin over k values.
+    def __init__(self, n_clusters=3, n_features=4096, random_state=0):
+        self.n_clusters = n_clusters
+        self.random_state = random_state
+        self.vectorizer = IdeaVectorizer(n_features=n_features)
+        self.model = None
+        self.sizes = np.zeros(n_clusters, dtype=np.int64)
+        self.pending = []
+
+    def partial_fit(self, ideas):
+        ideas = self.pending + list(ideas)
+        if self.model is None and len(ideas) < self.n_clusters:
+            # The first batch has to provide one sample per centroid
+            self.pending = ideas
+            return None
+        self.pending = []
+
+        vectors = self.vectorizer.transform(ideas, dense=False)
+        if self.model is None:
+            self.model = MiniBatchKMeans(n_clusters=self.n_clusters, random_state=self.random_state, n_init=3)
+        self.model.partial_fit(vectors)
+        labels = self.model.predict(vectors)
+        # Sizes count each idea in the cluster it joined; older ideas are not reassigned
+        self.sizes += np.bincount(labels, minlength=self.n_clusters)
+        return labels
+
+    def predict(self, ideas):
+        if self.model is None:
+            return None
+        return self.model.predict(self.vectorizer.transform(ideas, update=False, dense=False))
+
+    @property
+    def centroids(self):
+        return None if self.model is None else self.model.cluster_centers_
+
+    @property
+    def ideas_seen(self):
+        return int(self.sizes.sum())
+
+    def underexplored_cluster(self):
+        if self.model is None:
+            return None
+        return int(np.argmin(self.sizes))
+
+    def save(self, path):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(self, f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    @classmethod
+    def load_or_create(cls, path=None, **options):
+        # A saved model is only reused if it has the requested shape; otherwise a
+        # new one is started (and replaces the file on the next save)
+        clusterer = cls(**options)
+        if path and os.path.exists(path):
+            try:
+                saved = cls.load(path)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+                print(f"Error loading idea clusters from {path}: {e}")
+                return clusterer
+            if (saved.n_clusters, saved.vectorizer.n_features) != (clusterer.n_clusters, clusterer.vectorizer.n_features):
+                print(f"Ignoring idea clusters in {path}: saved with n_clusters={saved.n_clusters}, "
+                      f"n_features={saved.vectorizer.n_features}, requested n_clusters={clusterer.n_clusters}, "
+                      f"n_features={clusterer.vectorizer.n_features}")
+                return clusterer
+            return saved
+        return clusterer
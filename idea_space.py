@@ -0,0 +1,155 @@
+from itertools import islice
+import zlib
+
+IDEA_TEMPLATE = "A {} system that uses {} to address {} in the Cities of Light"
+
+
+def format_idea(concept_a, concept_b, challenge):
+    return IDEA_TEMPLATE.format(concept_a, concept_b, challenge)
+
+
+def index_dtype(size):
+    # Smallest unsigned integer type able to index a vocabulary of this size
+    import numpy as np
+
+    return np.min_scalar_type(max(size - 1, 0))
+
+
+class IdeaBatch:
+    # Compact batch of ideas stored as (concept_a, concept_b, challenge) index
+    # triples; idea strings are only built when an element is read.
+    def __init__(self, concepts, challenges, indices):
+        self.concepts = tuple(concepts)
+        self.challenges = tuple(challenges)
+        self.indices = indices
+
+    @classmethod
+    def draw(cls, concepts, challenges, num_ideas, seed=None):
+        if len(concepts) < 2:
+            raise ValueError("At least two concepts are required to generate ideas")
+        if not challenges:
+            raise ValueError("At least one challenge is required to generate ideas")
+
+        # NumPy is only needed for batches, so enumerating ideas does not import it
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        n_concepts = len(concepts)
+        concept_type = index_dtype(n_concepts)
+        challenge_type = index_dtype(len(challenges))
+
+        # Draw an ordered pair of distinct concepts per idea, like random.sample(concepts, 2)
+        concept_a = rng.integers(0, n_concepts, size=num_ideas)
+        concept_b = rng.integers(0, n_concepts - 1, size=num_ideas)
+        concept_b += concept_b >= concept_a
+
+        indices = np.empty(num_ideas, dtype=[
+            ("concept_a", concept_type),
+            ("concept_b", concept_type),
+            ("challenge", challenge_type)
+        ])
+        indices["concept_a"] = concept_a
+        indices["concept_b"] = concept_b
+        indices["challenge"] = rng.integers(0, len(challenges), size=num_ideas)
+        return cls(concepts, challenges, indices)
+
+    def idea(self, concept_a, concept_b, challenge):
+        return format_idea(self.concepts[concept_a], self.concepts[concept_b], self.challenges[challenge])
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return IdeaBatch(self.concepts, self.challenges, self.indices[key])
+        return self.idea(*self.indices[key])
+
+    def __iter__(self):
+        for concept_a, concept_b, challenge in self.indices.tolist():
+            yield self.idea(concept_a, concept_b, challenge)
+
+    def tolist(self):
+        return list(self)
+
+
+def _mix64(value):
+    # splitmix64 finalizer, used as the Feistel round function
+    value = (value + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return value ^ (value >> 31)
+
+
+def _vocabulary_fingerprint(concepts, challenges):
+    return zlib.crc32("\x1f".join(concepts).encode() + b"\x1e" + "\x1f".join(challenges).encode())
+
+
+class IdeaSpaceEnumerator:
+    # Streams every (ordered concept pair, challenge) triple exactly once in a seeded,
+    # shuffled order. The order is a keyed Feistel permutation of [0, size), so the
+    # space is never materialized and a run is resumed from just its position.
+    ROUNDS = 4
+
+    def __init__(self, concepts, challenges, seed=0, position=0, metrics=None):
+        if len(concepts) < 2:
+            raise ValueError("At least two concepts are required to enumerate ideas")
+        self.concepts = tuple(concepts)
+        self.challenges = tuple(challenges)
+        self.seed = seed
+        self.position = position
+        self.metrics = metrics
+        self.size = len(self.concepts) * (len(self.concepts) - 1) * len(self.challenges)
+
+        self._half_bits = max(1, (max(self.size - 1, 1).bit_length() + 1) // 2)
+        self._mask = (1 << self._half_bits) - 1
+        self._keys = [_mix64(seed * self.ROUNDS + r) for r in range(self.ROUNDS)]
+
+    @classmethod
+    def resume(cls, concepts, challenges, cursor, metrics=None):
+        if cursor["fingerprint"] != _vocabulary_fingerprint(concepts, challenges):
+            raise ValueError("Cursor was created for a different set of concepts or challenges")
+        return cls(concepts, challenges, seed=cursor["seed"], position=cursor["position"], metrics=metrics)
+
+    def cursor(self):
+        return {
+            "seed": self.seed,
+            "position": self.position,
+            "size": self.size,
+            "fingerprint": _vocabulary_fingerprint(self.concepts, self.challenges)
+        }
+
+    def permute(self, index):
+        # Cycle-walk the Feistel permutation of the enclosing power-of-two domain
+        # until it lands back inside [0, size)
+        value = index
+        while True:
+            left, right = value >> self._half_bits, value & self._mask
+            for key in self._keys:
+                left, right = right, left ^ (_mix64(right ^ key) & self._mask)
+            value = (left << self._half_bits) | right
+            if value < self.size:
+                return value
+
+    def unrank(self, rank):
+        pair, challenge = divmod(rank, len(self.challenges))
+        concept_a, offset = divmod(pair, len(self.concepts) - 1)
+        concept_b = offset + (offset >= concept_a)
+        return concept_a, concept_b, challenge
+
+    def remaining(self):
+        return self.size - self.position
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.position >= self.size:
+            raise StopIteration
+        concept_a, concept_b, challenge = self.unrank(self.permute(self.position))
+        self.position += 1
+        if self.metrics is not None:
+            self.metrics["ideas_generated"] += 1
+        return format_idea(self.concepts[concept_a], self.concepts[concept_b], self.challenges[challenge])
+
+    def take(self, count):
+        return list(islice(self, count))
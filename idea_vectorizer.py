@@ -0,0 +1,119 @@
+import json
+import os
+import zlib
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+# Batches with at most this many cells are returned as dense NumPy arrays
+DENSE_MAX_CELLS = 100_000
+
+
+class IdeaVectorizer:
+    # Bag-of-words vectorizer that is kept across calls. Column indices are stable:
+    # in vocabulary mode words get the next free column the first time they are
+    # seen and keep it, in hashed mode (n_features set) a word's column is the
+    # crc32 of the word modulo n_features, so the width never changes.
+    def __init__(self, n_features=None, tfidf=False, lowercase=False, dense_max_cells=DENSE_MAX_CELLS):
+        self.n_features = n_features
+        self.tfidf = tfidf
+        self.lowercase = lowercase
+        self.dense_max_cells = dense_max_cells
+        self.vocabulary = {}
+        self.document_frequency = [0] * n_features if n_features else []
+        self.num_documents = 0
+
+    @property
+    def width(self):
+        return self.n_features or len(self.vocabulary)
+
+    def tokenize(self, idea):
+        return (idea.lower() if self.lowercase else idea).split()
+
+    def feature_index(self, word, grow):
+        if self.n_features:
+            return zlib.crc32(word.encode()) % self.n_features
+        index = self.vocabulary.get(word)
+        if index is None and grow:
+            index = len(self.vocabulary)
+            self.vocabulary[word] = index
+            self.document_frequency.append(0)
+        return index
+
+    def transform(self, ideas, update=True, dense=None):
+        # Returns an (ideas x width) matrix of word counts, TF-IDF weighted if enabled.
+        # With update=True new words join the vocabulary and document frequencies grow;
+        # with update=False unseen words are ignored. dense=None picks a NumPy array
+        # for small batches and a CSR matrix otherwise.
+        indptr = [0]
+        indices = []
+        data = []
+        for idea in ideas:
+            counts = Counter()
+            for word in self.tokenize(idea):
+                index = self.feature_index(word, update)
+                if index is not None:
+                    counts[index] += 1
+            indices.extend(counts)
+            data.extend(counts.values())
+            indptr.append(len(indices))
+            if update:
+                for index in counts:
+                    self.document_frequency[index] += 1
+        if update:
+            self.num_documents += len(indptr) - 1
+
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, self.width)
+        )
+        if self.tfidf:
+            matrix = self.apply_tfidf(matrix)
+
+        if dense is None:
+            dense = matrix.shape[0] * matrix.shape[1] <= self.dense_max_cells
+        return matrix.toarray() if dense else matrix
+
+    def fit_transform(self, ideas, dense=None):
+        return self.transform(ideas, update=True, dense=dense)
+
+    def idf(self):
+        # Smoothed inverse document frequency, as in scikit-learn's TfidfTransformer
+        frequency = np.asarray(self.document_frequency[:self.width], dtype=np.float64)
+        return np.log((1 + self.num_documents) / (1 + frequency)) + 1
+
+    def apply_tfidf(self, matrix):
+        matrix = matrix.multiply(self.idf()).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms).dot(matrix).tocsr()
+
+    def to_dict(self):
+        return {
+            "n_features": self.n_features,
+            "tfidf": self.tfidf,
+            "lowercase": self.lowercase,
+            "vocabulary": self.vocabulary,
+            "document_frequency": self.document_frequency,
+            "num_documents": self.num_documents
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        vectorizer = cls(state["n_features"], state["tfidf"], state["lowercase"])
+        vectorizer.vocabulary = dict(state["vocabulary"])
+        vectorizer.document_frequency = list(state["document_frequency"])
+        vectorizer.num_documents = state["num_documents"]
+        return vectorizer
+
+    def save(self, path):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
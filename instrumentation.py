@@ -0,0 +1,281 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Latency histograms use log-linear buckets: four sub-buckets per power of two of
+# nanoseconds, so a percentile is accurate to within about 12% at any scale
+
+
+def bucket_index(ns):
+    if ns < 4:
+        return ns
+    exponent = ns.bit_length() - 1
+    return exponent * 4 + ((ns >> (exponent - 2)) & 3)
+
+
+def bucket_upper_bound(index):
+    if index < 4:
+        return index
+    exponent, sub_bucket = divmod(index, 4)
+    return (4 + sub_bucket + 1) << (exponent - 2)
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def record(self, ns):
+        index = bucket_index(ns)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+
+    def percentile(self, q):
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(bucket_upper_bound(index), self.max_ns)
+        return self.max_ns
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0,
+            "min_ms": (self.min_ns or 0) / 1e6,
+            "p50_ms": self.percentile(0.5) / 1e6,
+            "p95_ms": self.percentile(0.95) / 1e6,
+            "p99_ms": self.percentile(0.99) / 1e6,
+            "max_ms": self.max_ns / 1e6
+        }
+
+
+class Span:
+    __slots__ = ("instrumentation", "name", "category", "parent", "depth", "stack", "start_ns", "duration_ns")
+
+    def __init__(self, instrumentation, name, category=None):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.category = category
+        self.parent = None
+        self.depth = 0
+        self.stack = None
+        self.start_ns = 0
+        self.duration_ns = 0
+
+    @property
+    def path(self):
+        names = []
+        span = self
+        while span is not None:
+            names.append(span.name)
+            span = span.parent
+        return " > ".join(reversed(names))
+
+    def __enter__(self):
+        stack = self.stack = self.instrumentation.stack()
+        if stack:
+            self.parent = stack[-1]
+            self.depth = self.parent.depth + 1
+        stack.append(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        self.stack.pop()
+        self.instrumentation.finish(self)
+        return False
+
+
+class NullSpan:
+    # Returned by span() while instrumentation is disabled
+    name = None
+    category = None
+    parent = None
+    depth = 0
+    duration_ns = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Instrumentation:
+    # Call counts and latency histograms per span name, collected from nested spans.
+    # Sinks receive every finished span (record) and the aggregated histograms on
+    # export(). When disabled, span() returns a shared no-op span and decorated
+    # functions are called directly.
+    def __init__(self, enabled=True, sinks=None):
+        self.enabled = enabled
+        self.sinks = list(sinks or [])
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def configure(self, enabled=None, sinks=None):
+        if enabled is not None:
+            self.enabled = enabled
+        if sinks is not None:
+            self.sinks = list(sinks)
+
+    def stack(self):
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def span(self, name, category=None):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, category)
+
+    def current(self):
+        # Innermost span open on the current thread, None if there is none
+        stack = self.stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def attached(self, parent):
+        # Nests the spans opened on this thread under parent, a span still open on
+        # another thread; used for work handed to a thread pool
+        if parent is None:
+            yield
+            return
+        stack = self.stack()
+        stack.append(parent)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def in_category(self, *categories):
+        # True if a span of any of these categories is open on the current thread
+        return any(span.category in categories for span in self.stack())
+
+    def finish(self, span):
+        with self.lock:
+            histogram = self.histograms.get(span.name)
+            if histogram is None:
+                histogram = self.histograms[span.name] = Histogram()
+            histogram.record(span.duration_ns)
+        for sink in self.sinks:
+            sink.record(span)
+
+    def timed(self, name=None, category=None):
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, span_name, category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        with self.lock:
+            return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+
+    def export(self):
+        snapshot = self.snapshot()
+        return [sink.export(snapshot) for sink in self.sinks]
+
+
+class JSONLinesSink:
+    # Appends one JSON object per finished span, and one per span name on export
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = open(path, "a")
+
+    def write(self, record):
+        line = json.dumps(record)
+        with self.lock:
+            self.file.write(line + "\n")
+
+    def record(self, span):
+        self.write({
+            "type": "span",
+            "name": span.name,
+            "path": span.path,
+            "depth": span.depth,
+            "duration_ms": span.duration_ns / 1e6,
+            "timestamp": time.time()
+        })
+
+    def export(self, snapshot):
+        for name, summary in snapshot.items():
+            self.write(dict(summary, type="summary", name=name, timestamp=time.time()))
+        with self.lock:
+            self.file.flush()
+        return self.path
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+class PrometheusSink:
+    # Renders the histograms in the Prometheus text exposition format as summaries;
+    # with a path the text is written atomically for a node exporter textfile collector
+    def __init__(self, path=None, prefix="ideation"):
+        self.path = path
+        self.prefix = prefix
+
+    def record(self, span):
+        pass
+
+    def render(self, snapshot):
+        metric = f"{self.prefix}_span_duration_seconds"
+        lines = [
+            f"# HELP {metric} Latency of instrumented spans.",
+            f"# TYPE {metric} summary"
+        ]
+        for name, summary in snapshot.items():
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'{metric}{{span="{label}",quantile="{quantile}"}} {summary[key] / 1000:.9f}')
+            lines.append(f'{metric}_sum{{span="{label}"}} {summary["total_ms"] / 1000:.9f}')
+            lines.append(f'{metric}_count{{span="{label}"}} {summary["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, snapshot):
+        text = self.render(snapshot)
+        if self.path:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                f.write(text)
+            os.replace(temp_path, self.path)
+        return text
+
+
+# Shared instance used by the engine, the improvement module and the research
+# coordinator; IDEATION_INSTRUMENTATION=0 turns it off
+instrumentation = Instrumentation(enabled=os.environ.get("IDEATION_INSTRUMENTATION", "1") != "0")
@@ -0,0 +1,141 @@
+import argparse
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for the Cultural Evolution Simulator, Community Cohesion Network
+# and Cartographer of Light. Responses are derived from the idea text so runs
+# are repeatable.
+
+TRENDS = ["collaborative art", "digital minimalism", "shared dreaming", "sound architecture"]
+NEEDS = ["safer night transit", "intergenerational learning", "quiet public spaces", "energy sharing"]
+LAYOUT = {"areas": ["Luminara", "Nocturn", "Chromopolis", "Echovia"]}
+CONCERNS = ["privacy", "accessibility", "cost", "noise", "displacement"]
+
+
+def idea_score(idea, salt):
+    return (zlib.crc32(f"{salt}:{idea}".encode()) % 1000) / 1000
+
+
+def assess_impact(idea):
+    return {"impact_score": idea_score(idea, "impact"), "details": f"Projected cultural uptake for: {idea}"}
+
+
+def get_feedback(idea):
+    score = idea_score(idea, "feedback")
+    return {"feedback_score": score, "concerns": [CONCERNS[int(score * len(CONCERNS))]]}
+
+
+def analyze_spatial_impact(idea):
+    score = idea_score(idea, "spatial")
+    return {"spatial_score": score, "affected_areas": [LAYOUT["areas"][int(score * len(LAYOUT["areas"]))]]}
+
+
+GET_ROUTES = {
+    "/trends": lambda: TRENDS,
+    "/needs": lambda: NEEDS,
+    "/layout": lambda: LAYOUT
+}
+
+POST_ROUTES = {
+    "/assess_impact": assess_impact,
+    "/get_feedback": get_feedback,
+    "/analyze_spatial_impact": analyze_spatial_impact
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def record(self):
+        self.server.request_log.append((self.command, self.path))
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+    def do_GET(self):
+        self.record()
+        route = GET_ROUTES.get(self.path)
+        if route is None:
+            self.send_json(404, {"error": "not found"})
+            return
+        payload = route()
+        etag = f'"{zlib.crc32(json.dumps(payload).encode()):08x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_json(200, payload, {"ETag": etag})
+
+    def do_POST(self):
+        self.record()
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.endswith("/batch") and self.server.batch_enabled:
+            route = POST_ROUTES.get(self.path[:-len("/batch")])
+            if route is not None:
+                results = [{"id": item["id"], "result": route(item["idea"])} for item in payload["ideas"]]
+                self.send_json(200, {"results": results})
+                return
+        route = POST_ROUTES.get(self.path)
+        if route is None:
+            self.send_json(404, {"error": "not found"})
+            return
+        self.send_json(200, route(payload["idea"]))
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Concurrent clients open many connections at once; the default backlog of 5 drops SYNs
+    request_queue_size = 128
+
+
+def start_stub_server(host="127.0.0.1", port=0, delay=0.0, batch_enabled=True):
+    # Starts the stub in a background thread and returns (server, base_url)
+    server = StubServer((host, port), StubHandler)
+    server.delay = delay
+    server.batch_enabled = batch_enabled
+    server.request_log = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def connect_engine_to_stub(engine, base_url):
+    engine.connect_to_cultural_evolution_simulator(base_url)
+    engine.connect_to_community_cohesion_network(base_url)
+    engine.connect_to_cartographer_of_light(base_url)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stub of the Cities of Light integration endpoints.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--delay", type=float, default=0.0, help="Artificial latency per request in seconds")
+    parser.add_argument("--no-batch", action="store_true", help="Disable the /batch submission routes")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.host, args.port, args.delay, batch_enabled=not args.no_batch)
+    print(f"Integration stub listening on {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
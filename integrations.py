@@ -0,0 +1,267 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+from instrumentation import instrumentation
+
+# Connected system -> human readable name used in error messages
+INTEGRATION_SYSTEMS = {
+    "cultural_evolution_simulator": "Cultural Evolution Simulator",
+    "community_cohesion_network": "Community Cohesion Network",
+    "cartographer_of_light": "Cartographer of Light"
+}
+
+# Submission name -> (system, path)
+SUBMISSIONS = {
+    "cultural_impact": ("cultural_evolution_simulator", "/assess_impact"),
+    "community_feedback": ("community_cohesion_network", "/get_feedback"),
+    "spatial_analysis": ("cartographer_of_light", "/analyze_spatial_impact")
+}
+
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+# Status codes meaning an endpoint has no batch route; callers fall back to single requests
+BATCH_UNSUPPORTED_STATUS_CODES = {404, 405, 501}
+
+# Returned by a cache fetch function when the upstream answered 304 Not Modified
+NOT_MODIFIED = object()
+
+
+class IntegrationReadCache:
+    # TTL cache for integration reads. Entries younger than ttl are served as is;
+    # entries within the following stale_ttl seconds are served immediately while a
+    # background thread revalidates them (stale-while-revalidate). Revalidation sends
+    # the stored ETag so unchanged data costs a 304. With a snapshot_path the cache
+    # is persisted to disk so a cold start can serve the last known data at once.
+    def __init__(self, ttl=60, stale_ttl=3600, snapshot_path=None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.snapshot_path = snapshot_path
+        self.entries = {}
+        self.refreshing = set()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.load_snapshot()
+
+    def get(self, key, fetch):
+        # fetch(etag) returns (value, etag), (NOT_MODIFIED, etag) or (None, None) on error
+        # Refreshes run on background threads, so the entry is read and the hit or miss
+        # counted under the lock
+        with self.lock:
+            entry = self.entries.get(key)
+            age = None if entry is None else time.time() - entry["fetched_at"]
+            fresh = age is not None and age < self.ttl
+            stale = (age is not None and not fresh
+                     and (self.stale_ttl is None or age < self.ttl + self.stale_ttl))
+            if fresh or stale:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if fresh:
+            return entry["value"]
+        if stale:
+            self.refresh_in_background(key, fetch)
+            return entry["value"]
+        return self.refresh(key, fetch)
+
+    def refresh(self, key, fetch):
+        entry = self.entries.get(key)
+        value, etag = fetch(entry["etag"] if entry else None)
+        if value is NOT_MODIFIED and entry is not None:
+            with self.lock:
+                entry = dict(entry, fetched_at=time.time())
+                self.entries[key] = entry
+            self.save_snapshot()
+            return entry["value"]
+        if value is None or value is NOT_MODIFIED:
+            # Keep serving the last known data if the upstream is unavailable
+            return entry["value"] if entry else None
+        with self.lock:
+            self.entries[key] = {"value": value, "etag": etag, "fetched_at": time.time()}
+        self.save_snapshot()
+        return value
+
+    def refresh_in_background(self, key, fetch):
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+
+        def run():
+            # The "background" span keeps the refresh out of the engine's processing_time,
+            # which only counts time spent in calls made by the engine's caller
+            try:
+                with instrumentation.span("IntegrationReadCache.refresh_in_background", "background"):
+                    self.refresh(key, fetch)
+            finally:
+                with self.lock:
+                    self.refreshing.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def invalidate(self, key=None):
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+    def load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading integration cache snapshot: {e}")
+
+    def save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        with self.lock:
+            snapshot = json.dumps(self.entries)
+        temp_path = f"{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(snapshot)
+        os.replace(temp_path, self.snapshot_path)
+
+
+class AsyncIntegrationClient:
+    # Async client for the Cities of Light systems with one pooled keep-alive
+    # connection pool per endpoint. Use as "async with AsyncIntegrationClient(...)".
+    def __init__(self, endpoints, timeout=10.0, retries=2, backoff=0.2, max_connections=10, max_concurrency=50):
+        self.endpoints = {system: url for system, url in endpoints.items() if url}
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.clients = {}
+        self.batch_unsupported = set()
+
+    async def __aenter__(self):
+        # httpx is imported here so the engine can use the read cache without loading it
+        import httpx
+
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+        for system, url in self.endpoints.items():
+            self.clients[system] = httpx.AsyncClient(base_url=url, timeout=self.timeout, limits=limits)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.gather(*(client.aclose() for client in self.clients.values()))
+        self.clients = {}
+
+    async def send(self, system, method, path, payload=None):
+        # Returns the final response after retries, or None if the endpoint is unreachable
+        import httpx
+
+        client = self.clients.get(system)
+        if client is None:
+            return None
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = await client.request(method, path, json=payload)
+            except httpx.TransportError as e:
+                if attempt < self.retries:
+                    await asyncio.sleep(self.backoff * 2 ** attempt)
+                    continue
+                print(f"Error connecting to {INTEGRATION_SYSTEMS[system]}: {e}")
+                return None
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.retries:
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+                continue
+            return response
+
+    async def request(self, system, method, path, payload=None):
+        response = await self.send(system, method, path, payload)
+        if response is None:
+            return None
+        if response.status_code == 200:
+            return response.json()
+        print(f"Error calling {INTEGRATION_SYSTEMS[system]} {path}: {response.status_code}")
+        return None
+
+    async def get_cultural_trends(self):
+        return await self.request("cultural_evolution_simulator", "GET", "/trends")
+
+    async def get_community_needs(self):
+        return await self.request("community_cohesion_network", "GET", "/needs")
+
+    async def get_city_layout(self):
+        return await self.request("cartographer_of_light", "GET", "/layout")
+
+    async def fetch_integration_data(self):
+        return await asyncio.gather(self.get_cultural_trends(), self.get_community_needs(), self.get_city_layout())
+
+    async def submit(self, submission, idea):
+        system, path = SUBMISSIONS[submission]
+        return await self.request(system, "POST", path, {"idea": idea})
+
+    async def submit_idea(self, idea, submissions=None):
+        submissions = submissions or list(SUBMISSIONS)
+        results = await asyncio.gather(*(self.submit(submission, idea) for submission in submissions))
+        return dict(zip(submissions, results), idea=idea)
+
+    async def submit_ideas(self, ideas, submissions=None):
+        # Runs every submission for every idea concurrently, bounded by max_concurrency
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(idea):
+            async with semaphore:
+                return await self.submit_idea(idea, submissions)
+
+        return await asyncio.gather(*(bounded(idea) for idea in ideas))
+
+    async def submit_chunk(self, submission, chunk):
+        # Sends one chunk of (id, idea) pairs to the batch route and maps results back by id
+        system, path = SUBMISSIONS[submission]
+        if submission not in self.batch_unsupported:
+            payload = {"ideas": [{"id": idea_id, "idea": idea} for idea_id, idea in chunk]}
+            response = await self.send(system, "POST", f"{path}/batch", payload)
+            if response is None:
+                return {}
+            if response.status_code == 200:
+                return {item["id"]: item["result"] for item in response.json()["results"]}
+            if response.status_code not in BATCH_UNSUPPORTED_STATUS_CODES:
+                print(f"Error calling {INTEGRATION_SYSTEMS[system]} {path}/batch: {response.status_code}")
+                return {}
+            self.batch_unsupported.add(submission)
+
+        results = await asyncio.gather(*(self.submit(submission, idea) for _, idea in chunk))
+        return {idea_id: result for (idea_id, _), result in zip(chunk, results)}
+
+    async def submit_batch(self, submission, ideas, chunk_size=100, max_in_flight=4):
+        # ideas is a list (ids are positions) or a dict of id -> idea; returns id -> result.
+        # Chunks are pipelined with up to max_in_flight requests outstanding.
+        items = list(ideas.items() if isinstance(ideas, dict) else enumerate(ideas))
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def bounded(chunk):
+            async with semaphore:
+                return await self.submit_chunk(submission, chunk)
+
+        results = {}
+        for chunk_results in await asyncio.gather(*(bounded(chunk) for chunk in chunks)):
+            results.update(chunk_results)
+        return {idea_id: results.get(idea_id) for idea_id, _ in items}
+
+    async def submit_ideas_bulk(self, ideas, submissions=None, chunk_size=100, max_in_flight=4):
+        # Like submit_batch, ideas is a list or a dict of id -> idea; returns a list of
+        # per-idea rows for a list and a dict of id -> row for a dict
+        submissions = submissions or list(SUBMISSIONS)
+        per_submission = await asyncio.gather(*(
+            self.submit_batch(submission, ideas, chunk_size, max_in_flight) for submission in submissions
+        ))
+        items = ideas.items() if isinstance(ideas, dict) else enumerate(ideas)
+        rows = {
+            idea_id: dict({submission: results[idea_id] for submission, results in zip(submissions, per_submission)},
+                          idea=idea)
+            for idea_id, idea in items
+        }
+        return rows if isinstance(ideas, dict) else list(rows.values())
@@ -0,0 +1,185 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+# Chat-completion backends for the research coordinator. A backend only has to
+# implement complete(model, system, user) -> str, so the coordinator can run
+# against OpenAI or, in tests and offline runs, against FakeBackend.
+
+
+class LLMBackend:
+    def complete(self, model, system, user):
+        raise NotImplementedError
+
+
+class OpenAIBackend(LLMBackend):
+    # The openai package and client are only loaded on the first request
+    def __init__(self, client=None):
+        self._client = client
+        self.lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self.lock:
+            if self._client is None:
+                from openai import OpenAI
+
+                self._client = OpenAI()
+        return self._client
+
+    def complete(self, model, system, user):
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ]
+        )
+        return response.choices[0].message.content
+
+
+class FakeBackend(LLMBackend):
+    # Local stand-in that answers deterministically from the prompt. responder, if
+    # given, is called as responder(model, system, user); latency simulates a slow
+    # model. Every call is recorded in calls.
+    def __init__(self, responder=None, latency=0.0):
+        self.responder = responder
+        self.latency = latency
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def complete(self, model, system, user):
+        with self.lock:
+            self.calls.append((model, system, user))
+        if self.latency:
+            time.sleep(self.latency)
+        if self.responder is not None:
+            return self.responder(model, system, user)
+        digest = hashlib.sha256(f"{model}\0{system}\0{user}".encode()).hexdigest()[:12]
+        return f"[{model} {digest}] {len(user)} characters analyzed: {user[:80]!r}"
+
+
+def count_tokens(text, model="gpt-4"):
+    # Uses tiktoken when it is installed, otherwise estimates about four characters
+    # per token, which errs on the high side for English prose
+    encoding = token_encoding(model)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+_encodings = {}
+
+
+def token_encoding(model):
+    if model not in _encodings:
+        try:
+            import tiktoken
+        except ImportError:
+            _encodings[model] = None
+        else:
+            try:
+                _encodings[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                _encodings[model] = tiktoken.get_encoding("cl100k_base")
+    return _encodings[model]
+
+
+class CacheMiss(LookupError):
+    pass
+
+
+class CachedBackend(LLMBackend):
+    # Persistent response cache in front of another backend, keyed on the model,
+    # the system prompt and the SHA-256 of the user prompt. Entries older than ttl
+    # seconds are ignored and purged; once the stored responses exceed max_bytes the
+    # least recently used ones are evicted. With offline=True the wrapped backend is
+    # never called and a miss raises CacheMiss.
+    def __init__(self, backend, path="llm_cache.db", ttl=None, max_bytes=256 * 1024 * 1024, offline=False):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS llm_cache
+                                 (model TEXT, system TEXT, prompt_hash TEXT, response TEXT,
+                                  size INTEGER, created_at REAL, last_used REAL,
+                                  PRIMARY KEY (model, system, prompt_hash))''')
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_created_at ON llm_cache(created_at)")
+        # Running total of stored response bytes, kept in step with every insert and delete
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def lookup(self, key):
+        # Counts the hit or miss; hits and misses are only changed under the lock
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT response, size, created_at FROM llm_cache WHERE model = ? AND system = ? AND prompt_hash = ?",
+                key
+            ).fetchone()
+            now = time.time()
+            if row is not None and self.ttl is not None and now - row[2] > self.ttl:
+                with self.conn:
+                    self.conn.execute("DELETE FROM llm_cache WHERE model = ? AND system = ? AND prompt_hash = ?", key)
+                self.total_bytes -= row[1]
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE llm_cache SET last_used = ? WHERE model = ? AND system = ? AND prompt_hash = ?", (now,) + key
+                )
+            self.hits += 1
+            return row[0]
+
+    def store(self, key, response):
+        now = time.time()
+        size = len(response.encode())
+        with self.lock, self.conn:
+            replaced = self.conn.execute(
+                "SELECT size FROM llm_cache WHERE model = ? AND system = ? AND prompt_hash = ?", key
+            ).fetchone()
+            self.conn.execute("INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                              key + (response, size, now, now))
+            self.total_bytes += size - (replaced[0] if replaced else 0)
+            if self.max_bytes is not None and self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        # Runs only once an insert pushes the total over max_bytes: drops expired
+        # entries, then the least recently used ones until the total fits again
+        if self.ttl is not None:
+            cutoff = time.time() - self.ttl
+            expired = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache WHERE created_at < ?",
+                                        (cutoff,)).fetchone()[0]
+            self.conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (cutoff,))
+            self.total_bytes -= expired
+        stale = []
+        excess = self.total_bytes - self.max_bytes
+        for rowid, size in self.conn.execute("SELECT rowid, size FROM llm_cache ORDER BY last_used"):
+            if excess <= 0:
+                break
+            stale.append((rowid,))
+            excess -= size
+            self.total_bytes -= size
+        self.conn.executemany("DELETE FROM llm_cache WHERE rowid = ?", stale)
+
+    def complete(self, model, system, user):
+        key = (model, system, hashlib.sha256(user.encode()).hexdigest())
+        response = self.lookup(key)
+        if response is not None:
+            return response
+        if self.offline:
+            raise CacheMiss(f"No cached {model} response for this prompt (offline mode)")
+        response = self.backend.complete(model, system, user)
+        self.store(key, response)
+        return response
+
+    def close(self):
+        self.conn.close()
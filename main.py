@@ -3,8 +3,9 @@ import os
 import logging
 from ai_ideation_engine import EnhancedAIIdeationEngine
 from add_files import main as add_files
+from pipeline import ConceptPipeline
 
-def main():
+def main(workers=None, executor="process", ordered=True, seed=None, columnar_dir=None, spec_format="files"):
     # Set up logging
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     logger = logging.getLogger(__name__)
@@ -23,22 +24,18 @@ def main():
     # Generate new AI concepts
     new_concepts = ideation_engine.generate_ideas()
 
-    # Develop specifications for the new concepts
-    for concept in new_concepts:
-        spec = ideation_engine.develop_specification(concept)
-        safe_filename = "".join([c for c in concept if c.isalnum() or c in (' ', '-', '_')]).rstrip()
-        ideation_engine.save_specification(spec, f"specs/{safe_filename}.md")
-
-    # Assess the feasibility of the new concepts
-    for concept in new_concepts:
-        feasibility = ideation_engine.assess_feasibility(concept)
-        logger.info(f"Concept '{concept}' feasibility: {feasibility}")
-
-    # Refine the concepts through collaborative sessions
-    for concept in new_concepts:
-        refined_concept = ideation_engine.refine_concept(concept)
-        safe_filename = "".join([c for c in refined_concept if c.isalnum() or c in (' ', '-', '_')]).rstrip()
-        ideation_engine.save_specification(refined_concept, f"specs/{safe_filename}.md")
+    # Develop, assess, refine and save each concept as one unit of work
+    # Optionally mirror specs and scores into Parquet partitions for analysis
+    columnar_store = None
+    if columnar_dir:
+        from columnar_store import ColumnarStore
+        columnar_store = ColumnarStore(columnar_dir)
+
+    # spec_format="segments" appends specs to JSON-lines segment files instead of one file each
+    pipeline = ConceptPipeline(ideation_engine, workers=workers, executor=executor, ordered=ordered, seed=seed,
+                               columnar_store=columnar_store, spec_format=spec_format)
+    for result in pipeline.run(new_concepts):
+        logger.info(f"Concept '{result['concept']}' feasibility: {result['feasibility']}")
 
     # Run continuous improvement cycle
     improvement_suggestion = ideation_engine.run_continuous_improvement()
@@ -0,0 +1,74 @@
+import re
+
+from llm_backend import count_tokens
+
+# Splits extracted paper text into chunks that fit a token budget. Chunks follow
+# section boundaries where possible: whole sections are packed together until the
+# budget is reached, and only a section that is too long on its own is split
+# further, at paragraph, line, sentence and finally word boundaries.
+
+SECTION_NAMES = ("Abstract", "Introduction", "Related Work", "Background", "Preliminaries", "Method",
+                 "Methods", "Methodology", "Approach", "Experiments", "Experimental Setup", "Evaluation",
+                 "Results", "Discussion", "Limitations", "Conclusion", "Conclusions", "Future Work",
+                 "References", "Acknowledgements", "Acknowledgments", "Appendix")
+
+# A numbered heading ("3 Method", "4.2. Ablations") or a known section name alone on a line
+HEADING_PATTERN = re.compile(
+    r"^[ \t]*(?:\d+(?:\.\d+)*\.?[ \t]+[A-Z][^\n]{0,80}|(?:%s)\b[^\n]{0,40}|[A-Z][A-Z \t]{3,60})[ \t]*$"
+    % "|".join(SECTION_NAMES),
+    re.MULTILINE
+)
+
+SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+def split_sections(text):
+    starts = [match.start() for match in HEADING_PATTERN.finditer(text) if match.start() > 0]
+    bounds = [0] + starts + [len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:]) if text[start:end].strip()]
+
+
+def split_to_budget(text, max_tokens, count, separators=SEPARATORS):
+    # Pieces of text of at most max_tokens each, split at the coarsest separator
+    # that works; the separators stay attached to the pieces
+    if count(text) <= max_tokens:
+        return [text]
+    if not separators:
+        # No separator left (e.g. one very long word): cut by characters
+        step = max(1, len(text) * max_tokens // count(text))
+        return [text[start:start + step] for start in range(0, len(text), step)]
+    separator, rest = separators[0], separators[1:]
+    parts = text.split(separator)
+    if len(parts) == 1:
+        return split_to_budget(text, max_tokens, count, rest)
+    parts = [part + separator for part in parts[:-1]] + [parts[-1]]
+    pieces = []
+    for part in parts:
+        pieces.extend(split_to_budget(part, max_tokens, count, rest))
+    return pack(pieces, max_tokens, count)
+
+
+def pack(pieces, max_tokens, count):
+    # Greedily joins consecutive pieces while they stay within the budget
+    chunks = []
+    current, current_tokens = [], 0
+    for piece in pieces:
+        tokens = count(piece)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def chunk_text(text, max_tokens=3000, model="gpt-4"):
+    def count(piece):
+        return count_tokens(piece, model)
+
+    pieces = []
+    for section in split_sections(text):
+        pieces.extend(split_to_budget(section, max_tokens, count))
+    return [chunk for chunk in pack(pieces, max_tokens, count) if chunk.strip()]
@@ -0,0 +1,173 @@
+import os
+import random
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from ai_ideation_engine import EnhancedAIIdeationEngine
+from spec_sink import open_spec_sink
+
+_worker_state = threading.local()
+
+
+def worker_config(engine):
+    # Picklable copy of the engine settings that decide how a worker develops,
+    # scores and refines concepts, handed to every worker through the executor's
+    # initializer so workers behave like the engine the pipeline was built for
+    return {
+        "concepts": list(engine.concepts),
+        "ethical_guidelines": dict(engine.ethical_guidelines),
+        "refinement": engine.get_refinement().settings()
+    }
+
+
+def init_worker(config, seed):
+    # Workers never open knowledge_base.db; only the writer stage writes to it
+    engine = EnhancedAIIdeationEngine(spec_seed=seed, db_path=":memory:")
+    if config is not None:
+        engine.concepts = list(config["concepts"])
+        # Replace the default guidelines rather than merge into them
+        engine.ethical_guidelines = {}
+        engine.update_ethical_guidelines(config["ethical_guidelines"])
+        engine.configure_refinement(**config["refinement"])
+    _worker_state.engine = engine
+
+
+def _worker_engine(seed):
+    if getattr(_worker_state, "engine", None) is None:
+        init_worker(None, seed)
+    return _worker_state.engine
+
+
+def process_concept(concept, seed=None):
+    # One unit of work, run inside a worker
+    return evaluate_concept(_worker_engine(seed), concept, seed)
+
+
+def evaluate_concept(engine, concept, seed=None):
+    # develop -> assess -> refine
+    if seed is not None:
+        # Seed per concept rather than per worker so results do not depend on scheduling
+        engine.rng = random.Random(f"{seed}:{concept}")
+    spec = engine.get_specification(concept)
+    feasibility = engine.assess_feasibility(concept)
+    impact = engine.estimate_impact(concept)
+    ethical_score = engine.assess_ethical_feasibility(spec)
+    refined_spec = engine.refine_concept(concept)
+    # Scores of the refined spec itself, recorded next to it in the columnar store
+    refined_scores = engine.score_specs_batch([refined_spec])
+    refined_ethical_score = float(refined_scores["ethical_feasibility"][0])
+    return {
+        "concept": concept,
+        "spec": spec,
+        "feasibility": feasibility,
+        "impact": impact,
+        "ethical_score": ethical_score,
+        "approval_status": engine.approval_status(ethical_score),
+        "refined_spec": refined_spec,
+        "refined_feasibility": float(refined_scores["feasibility"][0]),
+        "refined_impact": float(refined_scores["impact"][0]),
+        "refined_ethical_score": refined_ethical_score,
+        "refined_approval_status": engine.approval_status(refined_ethical_score)
+    }
+
+
+class ConceptPipeline:
+    def __init__(self, engine, workers=None, executor="process", ordered=True, seed=None,
+                 specs_dir="specs", save_to_knowledge_base=True, kb_batch_size=500, columnar_store=None,
+                 spec_format="files", spec_sink=None):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown executor type: {executor}")
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = executor
+        self.ordered = ordered
+        self.seed = seed
+        self.specs_dir = specs_dir
+        self.save_to_knowledge_base = save_to_knowledge_base
+        self.kb_batch_size = kb_batch_size
+        # Optional ColumnarStore that receives every refined spec with its scores
+        self.columnar_store = columnar_store
+        # Spec files are written by a background writer; spec_format is "files" for
+        # one JSON file per spec or "segments" for JSON-lines segment files
+        self.spec_format = spec_format
+        self.spec_sink = spec_sink
+        self.pending_concepts = []
+        self.max_in_flight = self.workers * 4
+        self.logger = logging.getLogger(__name__)
+
+    def create_executor(self):
+        # Read when the run starts, so guideline or refinement changes made before then apply
+        initargs = (worker_config(self.engine), self.seed)
+        if self.executor == "process":
+            return ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=initargs)
+        return ThreadPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=initargs)
+
+    def process(self, concepts):
+        # Fans concepts out to the workers, keeping a bounded number in flight
+        with self.create_executor() as executor:
+            pending = deque() if self.ordered else set()
+            for concept in concepts:
+                future = executor.submit(process_concept, concept, self.seed)
+                if self.ordered:
+                    pending.append(future)
+                else:
+                    pending.add(future)
+                if len(pending) >= self.max_in_flight:
+                    yield from self.collect(pending, drain=False)
+            yield from self.collect(pending, drain=True)
+
+    def collect(self, pending, drain):
+        while pending:
+            if self.ordered:
+                yield pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    yield future.result()
+            if not drain:
+                return
+
+    def write(self, result):
+        # Single writer stage: the only place that touches spec files and SQLite
+        concept = result["concept"]
+        self.spec_sink.write(concept, result["spec"])
+        self.spec_sink.write(concept, result["refined_spec"], refined=True)
+        if self.save_to_knowledge_base:
+            self.pending_concepts.append((concept, result["refined_spec"]))
+            if len(self.pending_concepts) >= self.kb_batch_size:
+                self.flush()
+        if self.columnar_store is not None:
+            self.columnar_store.record(
+                concept, result["refined_spec"], feasibility=result["refined_feasibility"],
+                impact=result["refined_impact"], ethical_score=result["refined_ethical_score"],
+                approval_status=result["refined_approval_status"], refined=True
+            )
+        self.engine.update_performance_metrics(concept_refined=True, feasibility_score=result["feasibility"])
+
+    def flush(self):
+        if self.pending_concepts:
+            self.engine.add_concepts_bulk(self.pending_concepts)
+            self.pending_concepts = []
+
+    def run(self, concepts):
+        owns_sink = self.spec_sink is None
+        if owns_sink:
+            self.spec_sink = open_spec_sink(self.specs_dir, self.spec_format)
+        try:
+            for result in self.process(concepts):
+                self.write(result)
+                yield result
+        finally:
+            self.flush()
+            # The store writes a partition every rows_per_partition rows on its own;
+            # only the remainder is written here
+            if self.columnar_store is not None:
+                self.columnar_store.flush()
+            if owns_sink:
+                self.spec_sink.close()
+                self.spec_sink = None
+            else:
+                self.spec_sink.flush()
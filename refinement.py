@@ -0,0 +1,120 @@
+import copy
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import instrumentation
+
+# Panel roles -> (engine feedback generator, verb used in the feedback string)
+ROLES = {
+    "ai": ("generate_ai_feedback", "suggests"),
+    "human": ("generate_human_feedback", "recommends"),
+    "ethical": ("generate_ethical_feedback", "advises")
+}
+
+
+class EngineExpert:
+    # Panel member backed by one of the engine's built-in feedback generators.
+    # Any object with a `name` and feedback(spec, rng) -> str can sit on a panel,
+    # e.g. an expert that asks an LLM. The text after "<name> <verb>: " becomes the
+    # new feature; feedback without that prefix is used as it is.
+    def __init__(self, engine, role, name):
+        self.engine = engine
+        self.role = role
+        self.name = name
+        self.method, self.verb = ROLES[role]
+
+    def feedback(self, spec, rng):
+        return f"{self.name} {self.verb}: {getattr(self.engine, self.method)(self.name, spec, rng)}"
+
+
+def default_panel(engine):
+    return ([EngineExpert(engine, "ai", name) for name in engine.ai_panel]
+            + [EngineExpert(engine, "human", name) for name in engine.human_experts]
+            + [EngineExpert(engine, "ethical", name) for name in engine.ethical_review_board])
+
+
+class RefinementEngine:
+    # Multi-round refinement with a configurable panel. Each round picks which panel
+    # members' feedback gets incorporated first and only asks those members, so
+    # unused feedback is never generated. Every member asked gets its own Random
+    # seeded from the round's random source, so results do not depend on which
+    # thread finishes first. Concurrency is opt-in: with the default of one
+    # selection per round the member is asked on the calling thread, and only
+    # selections_per_round > 1 (e.g. members backed by a slow LLM) uses the pool.
+    # Feedback and its incorporation are recorded as spans nested under the caller's
+    # span, also when they run on pool threads.
+    #
+    # Panel members may also be given as (role, name) pairs, which stand for the
+    # engine's built-in generators (EngineExpert).
+    def __init__(self, engine, rounds=3, panel=None, selections_per_round=1, max_workers=None):
+        self.engine = engine
+        self.rounds = rounds
+        self.panel = ([EngineExpert(engine, *member) if isinstance(member, tuple) else member for member in panel]
+                      if panel is not None else default_panel(engine))
+        self.selections_per_round = min(selections_per_round, len(self.panel))
+        self.max_workers = max_workers or max(1, self.selections_per_round)
+        self._executor = None
+
+    def settings(self):
+        # Options that set up the same refinement on another engine, e.g. in a pipeline
+        # worker. Built-in members become (role, name) pairs; other members are passed
+        # as they are and must be picklable for process workers.
+        return {
+            "rounds": self.rounds,
+            "panel": [(member.role, member.name) if isinstance(member, EngineExpert) else member
+                      for member in self.panel],
+            "selections_per_round": self.selections_per_round,
+            "max_workers": self.max_workers
+        }
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="refinement")
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def ask(self, expert, spec, seed, parent=None):
+        with instrumentation.attached(parent), instrumentation.span(f"{type(expert).__name__}.feedback", "engine"):
+            return expert.feedback(spec, random.Random(seed))
+
+    def gather_feedback(self, spec, experts, seeds):
+        if len(experts) == 1:
+            return [self.ask(experts[0], spec, seeds[0])]
+        parent = instrumentation.current()
+        futures = [self.executor.submit(self.ask, expert, spec, seed, parent)
+                   for expert, seed in zip(experts, seeds)]
+        return [future.result() for future in futures]
+
+    def refine(self, concept, spec=None, rng=None):
+        # Refines a copy so the cached specification keeps describing the unrefined concept
+        rng = rng or self.engine.rng
+        spec = copy.deepcopy(spec if spec is not None else self.engine.get_specification(concept))
+        present_guidelines = self.engine.present_guidelines(spec)
+
+        for _ in range(self.rounds):
+            experts = rng.sample(self.panel, self.selections_per_round)
+            seeds = [rng.getrandbits(64) for _ in experts]
+            for feedback in self.gather_feedback(spec, experts, seeds):
+                spec = self.engine.apply_feedback(spec, feedback, present_guidelines, rng)
+        return spec
+
+    def refine_many(self, concepts, max_workers=4):
+        # Refines concepts concurrently, at most max_workers at a time. Specifications
+        # are looked up and per-concept random sources drawn up front on this thread,
+        # so the output only depends on the engine's random state, not on scheduling.
+        concepts = list(concepts)
+        specs = [self.engine.get_specification(concept) for concept in concepts]
+        rngs = [random.Random(self.engine.rng.getrandbits(64)) for _ in concepts]
+        parent = instrumentation.current()
+
+        def refine(concept, spec, rng):
+            with instrumentation.attached(parent):
+                return self.refine(concept, spec, rng)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refine") as pool:
+            return list(pool.map(refine, concepts, specs, rngs))
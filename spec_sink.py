@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+
+from instrumentation import instrumentation
+from specification import as_dict
+
+# Where pipeline runs write specifications. FileSpecSink keeps the original layout
+# of one JSON file per concept in specs/; SegmentSpecSink appends every spec as one
+# JSON line to a few large segment files and keeps an offset index next to them.
+# BackgroundSpecWriter moves either sink's writes onto a writer thread.
+
+# Longest file name (in bytes) most filesystems accept
+MAX_FILENAME_BYTES = 255
+
+
+def atomic_write(path, data, fsync=False):
+    # Writes to a temporary file in the same directory and renames it over path,
+    # so readers see either the old file or the complete new one
+    directory, name = os.path.split(path)
+    temp_path = os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(temp_path, "w") as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def spec_filename(concept, directory="specs", refined=False):
+    safe_filename = "".join([c for c in concept if c.isalnum() or c in (' ', '-', '_')]).rstrip()
+    suffix = " refined.md" if refined else ".md"
+    # Long concept sentences are cut and disambiguated with a hash of the full concept
+    limit = MAX_FILENAME_BYTES - len(suffix) - len(".tmp") - 40
+    if len(safe_filename.encode()) > limit:
+        digest = hashlib.sha1(concept.encode()).hexdigest()[:12]
+        safe_filename = f"{safe_filename.encode()[:limit - 13].decode(errors='ignore').rstrip()}-{digest}"
+    return os.path.join(directory, f"{safe_filename}{suffix}")
+
+
+class FileSpecSink:
+    # Compatibility layout: specs/<concept>.md holding the indented JSON. Refined
+    # specs go to "<concept> refined.md" instead of overwriting the original.
+    def __init__(self, directory="specs", fsync=False):
+        self.directory = directory
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, concept, refined=False):
+        return spec_filename(concept, self.directory, refined)
+
+    def write(self, concept, spec, refined=False):
+        self.write_batch([(concept, spec, refined)])
+
+    @instrumentation.timed()
+    def write_batch(self, records):
+        for concept, spec, refined in records:
+            atomic_write(self.path(concept, refined), json.dumps(as_dict(spec), indent=2), self.fsync)
+
+    def read(self, concept, refined=False):
+        try:
+            with open(self.path(concept, refined)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SegmentSpecSink:
+    # Appends {"concept", "refined", "spec"} records as JSON lines to
+    # <name>-00001.jsonl, <name>-00002.jsonl, ... and starts a new segment once the
+    # current one exceeds max_segment_bytes. <name>.idx is a JSON-lines index of
+    # [concept, refined, segment, offset, length]; the latest entry for a concept
+    # wins. Index entries are only written after the records they point to, and on
+    # open any segment bytes past the last indexed record (an interrupted write) are
+    # cut off, so the index never points at a partial record.
+    def __init__(self, directory="specs", name="specs", max_segment_bytes=64 * 1024 * 1024, fsync=False):
+        self.directory = directory
+        self.name = name
+        self.max_segment_bytes = max_segment_bytes
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self.index_path = os.path.join(directory, f"{name}.idx")
+        # (concept, refined) -> (segment, offset, length)
+        self.offsets = {}
+        os.makedirs(directory, exist_ok=True)
+        self.segment = self.load_index()
+        self.segment_file = None
+        self.index_file = None
+
+    def segment_path(self, segment):
+        return os.path.join(self.directory, f"{self.name}-{segment:05d}.jsonl")
+
+    def load_index(self):
+        # Returns the number of the segment new records are appended to
+        ends = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                valid_bytes = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        concept, refined, segment, offset, length = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                    self.offsets[(concept, refined)] = (segment, offset, length)
+                    ends[segment] = max(ends.get(segment, 0), offset + length)
+            if valid_bytes < os.path.getsize(self.index_path):
+                os.truncate(self.index_path, valid_bytes)
+        segment = max(ends, default=1)
+        path = self.segment_path(segment)
+        if os.path.exists(path) and os.path.getsize(path) > ends.get(segment, 0):
+            os.truncate(path, ends.get(segment, 0))
+        return segment
+
+    def open_files(self):
+        if self.segment_file is None:
+            self.segment_file = open(self.segment_path(self.segment), "ab")
+            self.index_file = open(self.index_path, "ab")
+
+    def write(self, concept, spec, refined=False):
+        self.write_batch([(concept, spec, refined)])
+
+    @instrumentation.timed()
+    def write_batch(self, records):
+        lines = [
+            (concept, refined,
+             (json.dumps({"concept": concept, "refined": refined, "spec": as_dict(spec)}) + "\n").encode())
+            for concept, spec, refined in records
+        ]
+        with self.lock:
+            self.open_files()
+            entries = []
+            for concept, refined, line in lines:
+                offset = self.segment_file.tell()
+                if offset and offset + len(line) > self.max_segment_bytes:
+                    self.roll_segment(entries)
+                    entries = []
+                    offset = 0
+                self.segment_file.write(line)
+                entries.append((concept, refined, self.segment, offset, len(line)))
+            self.write_index(entries)
+
+    def roll_segment(self, entries):
+        self.write_index(entries)
+        self.segment_file.close()
+        self.segment += 1
+        # Nothing in the new segment is indexed, so leftovers of an interrupted run go
+        self.segment_file = open(self.segment_path(self.segment), "wb")
+
+    def write_index(self, entries):
+        if not entries:
+            return
+        self.sync(self.segment_file)
+        self.index_file.write("".join(json.dumps(entry) + "\n" for entry in entries).encode())
+        self.sync(self.index_file)
+        for concept, refined, segment, offset, length in entries:
+            self.offsets[(concept, refined)] = (segment, offset, length)
+
+    def sync(self, f):
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def read(self, concept, refined=False):
+        location = self.offsets.get((concept, refined))
+        if location is None:
+            return None
+        segment, offset, length = location
+        with open(self.segment_path(segment), "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))["spec"]
+
+    def __iter__(self):
+        # Yields (concept, refined, spec) for the latest version of every spec
+        for (concept, refined) in list(self.offsets):
+            yield concept, refined, self.read(concept, refined)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def flush(self):
+        with self.lock:
+            if self.segment_file is not None:
+                self.sync(self.segment_file)
+                self.sync(self.index_file)
+
+    def close(self):
+        with self.lock:
+            if self.segment_file is not None:
+                self.segment_file.close()
+                self.index_file.close()
+                self.segment_file = self.index_file = None
+
+
+class BackgroundSpecWriter:
+    # Queues writes for a sink and performs them on one writer thread, in batches of
+    # up to batch_size. The queue is bounded, so a slow disk slows producers down
+    # instead of buffering without limit. An error on the writer thread is raised
+    # from the next write(), flush() or close().
+    def __init__(self, sink, max_queue=1024, batch_size=256):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name="spec-writer", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            records = [self.queue.get()]
+            while len(records) < self.batch_size:
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in records
+            records = [record for record in records if record is not None]
+            try:
+                if records and self.error is None:
+                    self.sink.write_batch(records)
+            except Exception as e:
+                self.error = e
+            finally:
+                for _ in range(len(records) + stop):
+                    self.queue.task_done()
+            if stop:
+                return
+
+    def raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def write(self, concept, spec, refined=False):
+        self.raise_error()
+        self.queue.put((concept, spec, refined))
+
+    def flush(self):
+        self.queue.join()
+        self.raise_error()
+        self.sink.flush()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self.sink.close()
+        self.raise_error()
+
+    def read(self, concept, refined=False):
+        self.flush()
+        return self.sink.read(concept, refined)
+
+
+def open_spec_sink(directory="specs", format="files", background=True, **options):
+    # format: "files" (one JSON file per spec) or "segments" (JSON-lines segments)
+    if format == "files":
+        sink = FileSpecSink(directory, **options)
+    elif format == "segments":
+        sink = SegmentSpecSink(directory, **options)
+    else:
+        raise ValueError(f"Unknown spec format: {format}")
+    return BackgroundSpecWriter(sink) if background else sink
@@ -0,0 +1,143 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from collections import Counter
+
+from specification import as_dict
+
+# Content-addressed storage for specifications in knowledge_base.db. A spec is
+# stored once in spec_blobs under the SHA-256 of its JSON, and each
+# specifications row only references that hash. Specs drawn from the same small
+# vocabularies repeat a lot, so duplicates cost one reference row instead of
+# another copy of the JSON.
+#
+# Compact a database written before the store existed:
+#
+#   python spec_store.py dedupe knowledge_base.db
+
+
+def spec_json(spec):
+    # Keys are sorted so equal specs always hash alike; list order is kept, since it
+    # records the order refinement added features and considerations in and specs
+    # must load back exactly as they were stored
+    return json.dumps(as_dict(spec), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def spec_hash(encoded):
+    # Raw 32-byte digest; half the size of the hex form in both tables
+    return hashlib.sha256(encoded.encode()).digest()
+
+
+class SpecStore:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def ensure_schema(self):
+        # refcount is the number of specifications rows referencing the blob. The engine
+        # only ever inserts specifications rows; `dedupe` recounts every refcount from
+        # the table, so it also repairs counts after rows were removed by hand.
+        c = self.conn.cursor()
+        c.execute('''CREATE TABLE IF NOT EXISTS spec_blobs
+                     (hash BLOB PRIMARY KEY, spec_json TEXT NOT NULL, refcount INTEGER NOT NULL)
+                     WITHOUT ROWID''')
+        c.execute("PRAGMA table_info(specifications)")
+        if "spec_hash" not in {row[1] for row in c.fetchall()}:
+            # Rows written before the store keep their inline spec_json until `dedupe` runs
+            c.execute("ALTER TABLE specifications ADD COLUMN spec_hash BLOB REFERENCES spec_blobs(hash)")
+
+    def put_many(self, c, specs):
+        # Stores the specs (one reference each) and returns their hashes in order;
+        # runs inside the caller's transaction
+        hashes = []
+        blobs = {}
+        for spec in specs:
+            encoded = spec_json(spec)
+            digest = spec_hash(encoded)
+            blobs.setdefault(digest, encoded)
+            hashes.append(digest)
+        c.executemany(
+            """INSERT INTO spec_blobs (hash, spec_json, refcount) VALUES (?, ?, ?)
+               ON CONFLICT(hash) DO UPDATE SET refcount = refcount + excluded.refcount""",
+            [(digest, blobs[digest], count) for digest, count in Counter(hashes).items()]
+        )
+        return hashes
+
+    def put(self, c, spec):
+        return self.put_many(c, [spec])[0]
+
+    def get(self, digest):
+        row = self.conn.execute("SELECT spec_json FROM spec_blobs WHERE hash = ?", (digest,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stats(self):
+        c = self.conn.cursor()
+        references = c.execute("SELECT COUNT(*) FROM specifications").fetchone()[0]
+        inline = c.execute("SELECT COUNT(*) FROM specifications WHERE spec_json IS NOT NULL").fetchone()[0]
+        blobs = c.execute("SELECT COUNT(*) FROM spec_blobs").fetchone()[0]
+        return {"references": references, "inline": inline, "blobs": blobs}
+
+    def dedupe(self, batch_size=10000):
+        # Moves inline spec_json into spec_blobs batch by batch, then recounts every
+        # blob's references from the specifications table, so refcounts are exact
+        # even if an earlier run was interrupted
+        c = self.conn.cursor()
+        moved = 0
+        while True:
+            rows = c.execute("SELECT id, spec_json FROM specifications WHERE spec_json IS NOT NULL LIMIT ?",
+                             (batch_size,)).fetchall()
+            if not rows:
+                break
+            with self.conn:
+                hashes = self.put_many(c, [json.loads(encoded) for _, encoded in rows])
+                c.executemany("UPDATE specifications SET spec_hash = ?, spec_json = NULL WHERE id = ?",
+                              [(digest, row_id) for digest, (row_id, _) in zip(hashes, rows)])
+            moved += len(rows)
+        with self.conn:
+            c.execute("UPDATE spec_blobs SET refcount = 0")
+            c.execute("""UPDATE spec_blobs SET refcount = refs.count
+                         FROM (SELECT spec_hash, COUNT(*) AS count FROM specifications
+                               WHERE spec_hash IS NOT NULL GROUP BY spec_hash) AS refs
+                         WHERE spec_blobs.hash = refs.spec_hash""")
+            c.execute("DELETE FROM spec_blobs WHERE refcount = 0")
+        return moved
+
+
+def dedupe_database(path, batch_size=10000, vacuum=True):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No knowledge base at {path}")
+    conn = sqlite3.connect(path)
+    try:
+        store = SpecStore(conn)
+        store.ensure_schema()
+        conn.commit()
+        size_before = os.path.getsize(path)
+        moved = store.dedupe(batch_size)
+        if vacuum:
+            conn.execute("VACUUM")
+        stats = store.stats()
+        stats.update(moved=moved, bytes_before=size_before, bytes_after=os.path.getsize(path))
+        return stats
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintenance for the content-addressed spec store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    dedupe = commands.add_parser("dedupe", help="Move inline specs into spec_blobs and reclaim the space")
+    dedupe.add_argument("database", nargs="?", default="knowledge_base.db")
+    dedupe.add_argument("--batch-size", type=int, default=10000)
+    dedupe.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM after compacting")
+    args = parser.parse_args()
+
+    if args.command == "dedupe":
+        stats = dedupe_database(args.database, args.batch_size, vacuum=not args.no_vacuum)
+        print(f"Moved {stats['moved']} inline specs; {stats['references']} specifications "
+              f"now share {stats['blobs']} blobs")
+        print(f"Database size: {stats['bytes_before']} -> {stats['bytes_after']} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import threading
+from array import array
+
+# Compact in-memory form of the specification dicts built by develop_specification.
+# Every string of the categorical list fields is interned once in a shared
+# Vocabulary and a specification keeps only small integer codes, so a million specs
+# hold a few arrays each instead of a million copies of the same feature and
+# guideline text. purpose ("To address <concept>") is unique per concept, so it is
+# kept as a plain string; interning it would grow the process-wide vocabulary with
+# every concept ever loaded.
+
+# Specification dict keys after "name", in the order develop_specification writes them
+FIELDS = ("purpose", "key_features", "required_resources", "potential_challenges",
+          "integration_points", "ethical_considerations")
+# Fields stored as vocabulary codes
+LIST_FIELDS = FIELDS[1:]
+
+# Marks a field that was absent from the source dict
+MISSING = object()
+
+
+class Vocabulary:
+    # Append-only string <-> code table
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        self.lock = threading.Lock()
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            with self.lock:
+                code = self.codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self.codes[value] = code
+        return code
+
+    def decode(self, codes):
+        values = self.values
+        return [values[code] for code in codes]
+
+    def __len__(self):
+        return len(self.values)
+
+
+# One shared vocabulary per list field (concepts appear through "Feature related
+# to ..." in key_features, guidelines through ethical_considerations)
+VOCABULARIES = {field: Vocabulary() for field in LIST_FIELDS}
+
+
+def is_encodable(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+class Specification:
+    # codes holds every list field's codes back to back; lengths holds how many
+    # belong to each field. List fields that are missing or not lists of strings are
+    # kept verbatim in extra, together with any keys develop_specification never
+    # writes, so to_dict() always returns a dict equal to the one given to from_dict().
+    __slots__ = ("name", "purpose", "codes", "lengths", "extra")
+
+    vocabularies = VOCABULARIES
+
+    def __init__(self, name, purpose, codes, lengths, extra=None):
+        self.name = name
+        self.purpose = purpose
+        self.codes = codes
+        self.lengths = lengths
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, spec):
+        codes = array("I")
+        lengths = array("H")
+        extra = {}
+        for field in LIST_FIELDS:
+            value = spec.get(field, MISSING)
+            if value is MISSING or not is_encodable(value):
+                extra[field] = value
+                lengths.append(0)
+                continue
+            vocabulary = cls.vocabularies[field]
+            codes.extend(vocabulary.code(item) for item in value)
+            lengths.append(len(value))
+        for key, value in spec.items():
+            if key != "name" and key not in FIELDS:
+                extra[key] = value
+        return cls(spec.get("name", MISSING), spec.get("purpose", MISSING), codes, lengths, extra or None)
+
+    def field_values(self):
+        # Yields (field, value) for every field in FIELDS order, MISSING if absent
+        yield "purpose", self.purpose
+        start = 0
+        extra = self.extra or {}
+        for field, length in zip(LIST_FIELDS, self.lengths):
+            if field in extra:
+                value = extra[field]
+            else:
+                value = self.vocabularies[field].decode(self.codes[start:start + length])
+            start += length
+            yield field, value
+
+    def to_dict(self):
+        spec = {} if self.name is MISSING else {"name": self.name}
+        for field, value in self.field_values():
+            if value is not MISSING:
+                spec[field] = value
+        for key, value in (self.extra or {}).items():
+            if key not in FIELDS:
+                spec[key] = value
+        return spec
+
+    def __getitem__(self, key):
+        # Read access like the dict form, e.g. spec["key_features"]
+        if key == "name" and self.name is not MISSING:
+            return self.name
+        if key in FIELDS:
+            for field, value in self.field_values():
+                if field == key and value is not MISSING:
+                    return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        if isinstance(other, Specification):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Specification({self.to_dict()!r})"
+
+    def __reduce__(self):
+        # Codes are only meaningful within this process's vocabularies, so pickles
+        # (e.g. results returned from pipeline worker processes) carry the dict form
+        return (Specification.from_dict, (self.to_dict(),))
+
+
+def as_dict(spec):
+    # Accepts either form and returns the JSON-ready dict
+    return spec.to_dict() if isinstance(spec, Specification) else spec
@@ -0,0 +1,181 @@
+import heapq
+import random
+from collections import defaultdict
+from itertools import combinations, product
+
+# Large prime for the MinHash universal hash family
+MINHASH_PRIME = (1 << 61) - 1
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+class SynergyIndex:
+    # In-memory inverted index used to find concept pairs that share tags.
+    #
+    # Concepts with identical tag sets always score the same against everything
+    # else, so they are grouped and the inverted index maps tag -> groups rather
+    # than tag -> concepts. Each group's tag set is also kept as a bitset. Pair
+    # scores are computed between groups and only expanded into concept pairs for
+    # the top k, so the cost grows with the number of distinct tag sets instead of
+    # quadratically with concepts per tag.
+    def __init__(self):
+        self.concept_tags = {}
+        self.groups = {}
+        self.group_tags = []
+        self.group_masks = []
+        self.group_members = []
+        self.tag_bits = {}
+        self.tag_groups = defaultdict(set)
+
+    @classmethod
+    def from_knowledge_base(cls, conn):
+        index = cls()
+        tags_by_concept = defaultdict(set)
+        for concept_id, tag_id in conn.execute("SELECT concept_id, tag_id FROM concept_tags"):
+            tags_by_concept[concept_id].add(tag_id)
+        for concept_id in sorted(tags_by_concept):
+            index.add(concept_id, tags_by_concept[concept_id])
+        return index
+
+    def add(self, concept_id, tag_ids):
+        tags = frozenset(tag_ids)
+        previous = self.concept_tags.get(concept_id)
+        if previous is not None:
+            if previous == tags:
+                return
+            self.group_members[self.groups[previous]].remove(concept_id)
+        self.concept_tags[concept_id] = tags
+
+        group = self.groups.get(tags)
+        if group is None:
+            group = len(self.group_tags)
+            self.groups[tags] = group
+            self.group_tags.append(tags)
+            self.group_masks.append(self.tag_mask(tags))
+            self.group_members.append([])
+            for tag in tags:
+                self.tag_groups[tag].add(group)
+        self.group_members[group].append(concept_id)
+
+    def tag_mask(self, tags):
+        # Tag set as an integer bitset, so shared tags are an AND plus a popcount
+        mask = 0
+        for tag in tags:
+            bit = self.tag_bits.setdefault(tag, len(self.tag_bits))
+            mask |= 1 << bit
+        return mask
+
+    def __len__(self):
+        return len(self.concept_tags)
+
+    def tag_frequency(self, tag):
+        return sum(len(self.group_members[group]) for group in self.tag_groups[tag])
+
+    def skipped_mask(self, max_tag_frequency):
+        # Tags attached to more than max_tag_frequency concepts say little about
+        # synergy and dominate the cost, so they can be left out of the scores
+        if max_tag_frequency is None:
+            return 0
+        return self.tag_mask(tag for tag in self.tag_groups if self.tag_frequency(tag) > max_tag_frequency)
+
+    def lsh_group_pairs(self, num_perm=32, bands=8, seed=0):
+        # MinHash signatures of each group's tag set, banded so that only groups
+        # likely to have a high Jaccard similarity become candidates
+        rng = random.Random(seed)
+        coefficients = [(rng.randrange(1, MINHASH_PRIME), rng.randrange(MINHASH_PRIME)) for _ in range(num_perm)]
+        rows = num_perm // bands
+        buckets = defaultdict(list)
+        for group, tags in enumerate(self.group_tags):
+            if not self.group_members[group] or not tags:
+                continue
+            signature = [min((a * hash(tag) + b) % MINHASH_PRIME for tag in tags) for a, b in coefficients]
+            for band in range(bands):
+                buckets[(band, tuple(signature[band * rows:(band + 1) * rows]))].append(group)
+        pairs = set()
+        for groups in buckets.values():
+            pairs.update(combinations(sorted(groups), 2))
+        return pairs
+
+    def top_pairs(self, k=10, metric="shared", min_common_tags=2, max_tag_frequency=None, lsh_threshold=5000):
+        # Returns up to k (concept_id_a, concept_id_b, score) with concept_id_a < concept_id_b,
+        # best score first. metric is "shared" (common tag count) or "jaccard".
+        if metric not in ("shared", "jaccard"):
+            raise ValueError(f"Unknown synergy metric: {metric}")
+        if k <= 0:
+            return []
+
+        keep = ~self.skipped_mask(max_tag_frequency)
+        active = {}
+        for group, mask in enumerate(self.group_masks):
+            if self.group_members[group]:
+                mask &= keep
+                active[group] = (mask, popcount(mask))
+
+        best = []
+
+        def consider(value, group_a, group_b):
+            entry = (value, -group_a, -group_b)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+
+        def score(group_a, group_b):
+            (mask_a, size_a), (mask_b, size_b) = active[group_a], active[group_b]
+            shared = popcount(mask_a & mask_b)
+            if shared < min_common_tags:
+                return None
+            return shared if metric == "shared" else shared / (size_a + size_b - shared)
+
+        for group, (mask, size) in active.items():
+            # Concepts with the same tag set pair with each other too
+            if len(self.group_members[group]) > 1 and size >= min_common_tags:
+                consider(size if metric == "shared" else 1.0, group, group)
+
+        if metric == "jaccard" and len(active) > lsh_threshold:
+            for group_a, group_b in self.lsh_group_pairs():
+                value = score(group_a, group_b)
+                if value is not None:
+                    consider(value, group_a, group_b)
+        else:
+            # Largest tag sets first: a pair can share at most as many tags as the smaller
+            # set has (and reach at most smaller / larger Jaccard), so once that bound falls
+            # below the current k-th best score the remaining pairs cannot enter the top k
+            order = sorted(active, key=lambda group: (-active[group][1], group))
+            for i, group_a in enumerate(order):
+                size_a = active[group_a][1]
+                if size_a < min_common_tags or (metric == "shared" and len(best) >= k and size_a < best[0][0]):
+                    break
+                for group_b in order[i + 1:]:
+                    size_b = active[group_b][1]
+                    bound = size_b if metric == "shared" else size_b / size_a
+                    if size_b < min_common_tags or (len(best) >= k and bound < best[0][0]):
+                        break
+                    value = score(group_a, group_b)
+                    if value is not None:
+                        consider(value, min(group_a, group_b), max(group_a, group_b))
+
+        pairs = []
+        for value, group_a, group_b in sorted(best, reverse=True):
+            # Expand the group pair lazily; only k concept pairs are ever materialized
+            members = sorted(self.group_pair_members(-group_a, -group_b, k - len(pairs)))
+            pairs.extend((a, b, value) for a, b in members)
+            if len(pairs) >= k:
+                break
+        return pairs
+
+    def group_pair_members(self, group_a, group_b, limit):
+        members_a = sorted(self.group_members[group_a])
+        if group_a == group_b:
+            pairs = combinations(members_a, 2)
+        else:
+            members_b = sorted(self.group_members[group_b])
+            pairs = ((min(a, b), max(a, b)) for a, b in product(members_a, members_b))
+        result = []
+        for pair in pairs:
+            result.append(pair)
+            if len(result) >= limit:
+                break
+        return result
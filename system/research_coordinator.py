@@ -1,20 +1,65 @@
 import logging
+import os
 import requests
-import PyPDF2
 import io
-from openai import OpenAI
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+from instrumentation import instrumentation
+from llm_backend import CachedBackend, OpenAIBackend, count_tokens
+from paper_chunking import chunk_text, pack
+
+# Downloads are read in chunks of this size and kept in memory up to SPOOL_MAX_SIZE,
+# beyond which the spooled file moves to disk
+CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+DOWNLOAD_TIMEOUT = 60
+
+ANALYST_SYSTEM = "You are an AI research analyst specializing in conducting thorough Literature Content Analysis of complex AI papers."
+POST_WRITER_SYSTEM = "You are an AI research communicator specializing in creating engaging posts about AI research for online communities."
+
+CHUNK_PROMPT = """
+        You are reading part {index} of {total} of the research paper from {url}.
+        Analyze only this part. Note its key findings, methods, theoretical framework, data
+        collection and analysis, limitations, implications for autonomous AI systems and any
+        novel approaches it introduces. Be specific and concise; the partial analyses of all
+        parts will be combined into one Literature Content Analysis.
+        """
+
+MERGE_PROMPT = """
+        Merge the following partial analyses of consecutive parts of the research paper from
+        {url} into one partial analysis. Keep every specific finding, method and limitation;
+        remove repetition.
+        """
+
 
 class ResearchCoordinator:
-    def __init__(self):
+    # Papers longer than chunk_tokens are analyzed map-reduce style: each chunk is
+    # analyzed separately, up to max_concurrency at a time, and the partial
+    # analyses are combined into the final analysis. Every model call, including
+    # each chunk, goes through a persistent response cache (cache_path=None turns it
+    # off); offline=True answers from the cache only and fails on a miss.
+    def __init__(self, backend=None, model="gpt-4", chunk_tokens=3000, max_concurrency=4,
+                 cache_path="llm_cache.db", cache_ttl=None, cache_max_bytes=256 * 1024 * 1024, offline=False):
         self.logger = logging.getLogger(__name__)
-        self.client = OpenAI()
-
-    def process_paper(self):
-        url = self.read_url_from_file()
+        backend = backend or OpenAIBackend()
+        if cache_path:
+            backend = CachedBackend(backend, cache_path, ttl=cache_ttl, max_bytes=cache_max_bytes, offline=offline)
+        elif offline:
+            raise ValueError("Offline mode needs a response cache (cache_path)")
+        self.backend = backend
+        self.model = model
+        self.chunk_tokens = chunk_tokens
+        self.max_concurrency = max_concurrency
+
+    @instrumentation.timed()
+    def process_paper(self, url=None):
+        url = url or self.read_url_from_file()
         self.logger.info(f"Processing paper from URL: {url}")
         try:
-            pdf_content = self.download_pdf(url)
-            text_content = self.read_pdf(pdf_content)
+            with self.open_pdf(url) as pdf_content:
+                text_content = self.read_pdf(pdf_content)
             analysis = self.analyze_paper(text_content, url)
             post_content = self.create_post(url, analysis)
             self.create_post_file(url, post_content)
@@ -33,20 +78,55 @@ class ResearchCoordinator:
             self.logger.error(f"Error reading URL from file: {str(e)}")
             raise
 
-    def download_pdf(self, url):
-        response = requests.get(url)
-        response.raise_for_status()
-        return io.BytesIO(response.content)
+    def local_path(self, source):
+        # Path for file:// URLs and plain paths, None for anything to download
+        parsed = urlparse(source)
+        if parsed.scheme == "file":
+            return url2pathname(parsed.path)
+        if parsed.scheme in ("http", "https"):
+            return None
+        return source
+
+    def open_pdf(self, source):
+        # Returns a binary file object for a URL, file:// URL or local path
+        path = self.local_path(source)
+        if path is not None:
+            return open(os.path.expanduser(path), "rb")
+        return self.download_pdf(source)
+
+    @instrumentation.timed()
+    def download_pdf(self, url, chunk_size=CHUNK_SIZE):
+        # Streams the response into a spooled temporary file, so large papers end up
+        # on disk instead of in memory
+        pdf_file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        try:
+            with requests.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    pdf_file.write(chunk)
+        except Exception:
+            pdf_file.close()
+            raise
+        pdf_file.seek(0)
+        return pdf_file
+
+    def iter_pages(self, pdf_content):
+        # Extracts page text one page at a time
+        import PyPDF2
 
-    def read_pdf(self, pdf_content):
         reader = PyPDF2.PdfReader(pdf_content)
-        text = ""
         for page in reader.pages:
-            text += page.extract_text()
-        return text
+            yield page.extract_text() or ""
 
-    def analyze_paper(self, text, url):
-        prompt = f"""
+    @instrumentation.timed()
+    def read_pdf(self, pdf_content):
+        text = io.StringIO()
+        for page_text in self.iter_pages(pdf_content):
+            text.write(page_text)
+        return text.getvalue()
+
+    def analysis_prompt(self, url):
+        return f"""
         Perform a detailed Literature Content Analysis (LCA) of the following research paper from {url}. 
         Focus on:
         1. Key findings and their significance
@@ -60,24 +140,60 @@ class ResearchCoordinator:
         Provide a comprehensive and critical analysis, highlighting strengths and potential areas for further research.
         """
 
+    @instrumentation.timed()
+    def analyze_paper(self, text, url):
+        prompt = self.analysis_prompt(url)
+
         self.logger.info("Analyzer Input:")
         self.logger.info(f"Prompt: {prompt}")
         self.logger.info(f"Text (truncated): {text[:500]}...")
 
-        response = self.client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an AI research analyst specializing in conducting thorough Literature Content Analysis of complex AI papers."},
-                {"role": "user", "content": f"{prompt}\n\nPaper content:\n{text}"}  # Include full text
-            ]
-        )
+        if count_tokens(text, self.model) <= self.chunk_tokens:
+            analysis = self.backend.complete(self.model, ANALYST_SYSTEM, f"{prompt}\n\nPaper content:\n{text}")
+        else:
+            analysis = self.map_reduce_analysis(text, url, prompt)
 
-        analysis = response.choices[0].message.content
         self.logger.info("Analyzer Output:")
         self.logger.info(f"Analysis: {analysis}")
 
         return analysis
 
+    def map_reduce_analysis(self, text, url, prompt):
+        chunks = chunk_text(text, self.chunk_tokens, self.model)
+        total = len(chunks)
+        self.logger.info(f"Analyzing {total} chunks with up to {self.max_concurrency} concurrent requests")
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            partials = list(pool.map(
+                lambda item: self.analyze_chunk(CHUNK_PROMPT.format(index=item[0], total=total, url=url), item[1]),
+                enumerate(chunks, 1)
+            ))
+            partials = self.merge_partials(partials, url, pool)
+        combined = "\n\n".join(f"Partial analysis {index}:\n{partial}" for index, partial in enumerate(partials, 1))
+        return self.backend.complete(
+            self.model, ANALYST_SYSTEM,
+            f"{prompt}\n\nThe paper was analyzed in {total} parts. Base the analysis on these partial analyses:\n{combined}"
+        )
+
+    @instrumentation.timed()
+    def analyze_chunk(self, prompt, chunk):
+        return self.backend.complete(self.model, ANALYST_SYSTEM, f"{prompt}\n\nPaper content:\n{chunk}")
+
+    def merge_partials(self, partials, url, pool):
+        # Partial analyses that together exceed the budget are merged in groups,
+        # repeatedly, until they fit into the final request
+        def count(text):
+            return count_tokens(text, self.model)
+
+        prompt = MERGE_PROMPT.format(url=url)
+        while len(partials) > 1 and sum(count(partial) for partial in partials) > self.chunk_tokens:
+            groups = pack([partial + "\n\n" for partial in partials], self.chunk_tokens, count)
+            if len(groups) == len(partials):
+                # Every partial is too long to share a group; merge them in pairs
+                groups = ["\n\n".join(partials[start:start + 2]) for start in range(0, len(partials), 2)]
+            partials = list(pool.map(lambda group: self.analyze_chunk(prompt, group), groups))
+        return partials
+
+    @instrumentation.timed()
     def create_post(self, url, analysis):
         prompt = f"""
         Based on the following detailed analysis of a research paper, create an engaging and informative post for the r/autonomousAIs community. The post should:
@@ -102,15 +218,7 @@ class ResearchCoordinator:
         self.logger.info(f"Analysis: {analysis}")
         self.logger.info(f"URL: {url}")
 
-        response = self.client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an AI research communicator specializing in creating engaging posts about AI research for online communities."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-
-        post_content = response.choices[0].message.content
+        post_content = self.backend.complete(self.model, POST_WRITER_SYSTEM, prompt)
         self.logger.info("Post Writer Output:")
         self.logger.info(f"Post Content: {post_content}")
 
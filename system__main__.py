@@ -1,15 +1,31 @@
 import argparse
 import logging
-from research_coordinator import ResearchCoordinator
+import os
+import sys
+
+# The coordinator lives in system/ and imports instrumentation, llm_backend and
+# paper_chunking from the repository root, so both go on sys.path whether this
+# file runs as system/__main__.py or from the repository root
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = HERE if os.path.isdir(os.path.join(HERE, "system")) else os.path.dirname(HERE)
+for path in (REPO_ROOT, os.path.join(REPO_ROOT, "system")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from research_coordinator import ResearchCoordinator  # noqa: E402
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 def main():
     parser = argparse.ArgumentParser(description="AI Research Coordinator")
     parser.add_argument("url", help="URL of the research paper to analyze")
+    parser.add_argument("--offline", action="store_true",
+                        help="Only use cached model responses; fail instead of calling the API")
+    parser.add_argument("--cache", default="llm_cache.db", help="SQLite file for cached model responses")
+    parser.add_argument("--cache-ttl", type=float, default=None, help="Seconds before a cached response expires")
     args = parser.parse_args()
 
-    coordinator = ResearchCoordinator()
+    coordinator = ResearchCoordinator(cache_path=args.cache, cache_ttl=args.cache_ttl, offline=args.offline)
     coordinator.process_paper(args.url)
 
 if __name__ == "__main__":
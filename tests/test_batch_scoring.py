@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from ai_ideation_engine import EnhancedAIIdeationEngine
+
+
+def scored_engine(guidelines=None, count=300):
+    # Developed specs plus refined ones, which have more features and considerations
+    # and so reach the clipping bounds, all registered in the spec cache by name
+    random.seed(13)
+    engine = EnhancedAIIdeationEngine(spec_seed=13, spec_cache_size=2 * count, db_path=":memory:")
+    if guidelines:
+        engine.update_ethical_guidelines(guidelines)
+    concepts = [f"Concept {index}" for index in range(count)]
+    for concept in concepts[::3]:
+        engine.spec_cache.put(f"{concept} refined", engine.refine_concept(concept))
+        concepts.append(f"{concept} refined")
+    engine.spec_cache.put("Empty", {"name": "Empty", "purpose": "", "key_features": [], "integration_points": [],
+                                    "potential_challenges": [], "required_resources": [], "ethical_considerations": []})
+    concepts.append("Empty")
+    return engine, concepts
+
+
+@pytest.mark.parametrize("guidelines", [None, {"diversity": "Increase focus on generating diverse ideas",
+                                               "practicality": "Prioritize practical and implementable ideas"}])
+def test_batch_scores_are_identical_to_the_scalar_path(guidelines):
+    engine, concepts = scored_engine(guidelines)
+    specs = [engine.get_specification(concept) for concept in concepts]
+    scores = engine.score_specs_batch(specs)
+
+    for index, (concept, spec) in enumerate(zip(concepts, specs)):
+        # Exact float equality: the batch path promises bit-identical results
+        assert scores["technical_feasibility"][index] == engine.assess_technical_feasibility(spec), concept
+        assert scores["resource_feasibility"][index] == engine.assess_resource_feasibility(spec), concept
+        assert scores["ethical_feasibility"][index] == engine.assess_ethical_feasibility(spec), concept
+        assert scores["feasibility"][index] == engine.assess_feasibility(concept), concept
+        assert scores["impact"][index] == engine.estimate_impact(concept), concept
+
+    assert engine.score_concepts_batch(concepts)["feasibility"].tolist() == scores["feasibility"].tolist()
@@ -0,0 +1,59 @@
+import random
+
+from guideline_matcher import GuidelineMatcher
+
+KEYWORDS = ("privacy", "fairness", "transparency", "accountability", "safety")
+
+GUIDELINES = {
+    "privacy": "Ensure user data is protected and used only with explicit consent",
+    "fairness": "Avoid bias and discrimination in AI decision-making processes",
+    "transparency": "Provide clear explanations of AI system functionality and decision rationale",
+    "accountability": "Establish clear lines of responsibility for AI system actions",
+    "safety": "Implement robust safeguards to prevent harm to individuals or society",
+    "human_oversight": "Maintain meaningful human control over critical AI systems",
+    "environmental_impact": "Minimize the ecological footprint of AI systems",
+    "social_good": "Prioritize AI applications that benefit humanity and the environment"
+}
+
+WORDS = ["Privacy", "FAIRNESS", "transparency", "Accountability", "safety", "Safety-critical", "human",
+         "oversight", "human_oversight", "Human Oversight", "environmental", "impact", "environmental_impact",
+         "social good", "Social_Good", "data", "bias", "the", "of", "AI"]
+
+
+def keyword_loop(consideration, keywords):
+    # The scoring loop assess_ethical_feasibility used before the matcher
+    hits = 0
+    for keyword in keywords:
+        if keyword in consideration.lower():
+            hits += 1
+    return hits
+
+
+def texts(seed, count=2000):
+    rng = random.Random(seed)
+    generated = [f"{key.capitalize()}: {text}" for key, text in GUIDELINES.items()]
+    for _ in range(count):
+        generated.append(rng.choice(["", " ", "_"]).join(rng.choices(WORDS, k=rng.randint(0, 8))))
+    return generated
+
+
+def test_matches_original_keyword_loop():
+    matcher = GuidelineMatcher(KEYWORDS)
+    for text in texts(1):
+        assert matcher.count(text) == keyword_loop(text, KEYWORDS), text
+
+
+def test_underscore_keys_match_spaces():
+    matcher = GuidelineMatcher(GUIDELINES)
+    spelled = [(key, key.replace("_", " ")) for key in GUIDELINES]
+    for text in texts(2):
+        lowered = text.lower()
+        expected = {key for key, words in spelled if key in lowered or words in lowered.replace("_", " ")}
+        assert matcher.hits(text) == expected, text
+        assert matcher.count(text) == len(expected)
+
+
+def test_keys_differing_only_in_spelling_count_once():
+    matcher = GuidelineMatcher(["social_good", "Social Good"])
+    assert matcher.count("social good for all") == 1
+    assert GuidelineMatcher({}).count("privacy") == 0
@@ -0,0 +1,66 @@
+from itertools import permutations
+
+import pytest
+
+from idea_space import IdeaBatch, IdeaSpaceEnumerator, format_idea
+
+CONCEPTS = ["AI", "robotics", "quantum computing", "neural networks", "blockchain", "virtual reality"]
+CHALLENGES = ["energy efficiency", "public health", "education", "mobility", "water scarcity"]
+
+
+def all_ideas(concepts=CONCEPTS, challenges=CHALLENGES):
+    return {format_idea(a, b, challenge) for a, b in permutations(concepts, 2) for challenge in challenges}
+
+
+@pytest.mark.parametrize("n_concepts,n_challenges", [(2, 1), (3, 2), (6, 5), (17, 11), (40, 31)])
+@pytest.mark.parametrize("seed", [0, 1, 12345])
+def test_permutation_is_a_bijection(n_concepts, n_challenges, seed):
+    enumerator = IdeaSpaceEnumerator([f"c{i}" for i in range(n_concepts)],
+                                     [f"h{i}" for i in range(n_challenges)], seed=seed)
+    assert sorted(enumerator.permute(index) for index in range(enumerator.size)) == list(range(enumerator.size))
+
+
+def test_enumerates_every_idea_exactly_once():
+    ideas = list(IdeaSpaceEnumerator(CONCEPTS, CHALLENGES, seed=7))
+    assert len(ideas) == len(set(ideas)) == len(CONCEPTS) * (len(CONCEPTS) - 1) * len(CHALLENGES)
+    assert set(ideas) == all_ideas()
+
+
+def test_seed_changes_only_the_order():
+    first = list(IdeaSpaceEnumerator(CONCEPTS, CHALLENGES, seed=1))
+    second = list(IdeaSpaceEnumerator(CONCEPTS, CHALLENGES, seed=2))
+    assert first != second
+    assert sorted(first) == sorted(second)
+    assert list(IdeaSpaceEnumerator(CONCEPTS, CHALLENGES, seed=1)) == first
+
+
+def test_resumes_from_a_cursor():
+    full = list(IdeaSpaceEnumerator(CONCEPTS, CHALLENGES, seed=3))
+    enumerator = IdeaSpaceEnumerator(CONCEPTS, CHALLENGES, seed=3)
+    head = enumerator.take(42)
+    cursor = dict(enumerator.cursor())
+
+    resumed = IdeaSpaceEnumerator.resume(CONCEPTS, CHALLENGES, cursor)
+    assert resumed.remaining() == len(full) - 42
+    assert head + list(resumed) == full
+    assert resumed.take(1) == []
+
+
+def test_cursor_is_tied_to_the_vocabulary():
+    cursor = IdeaSpaceEnumerator(CONCEPTS, CHALLENGES).cursor()
+    with pytest.raises(ValueError):
+        IdeaSpaceEnumerator.resume(CONCEPTS + ["swarm intelligence"], CHALLENGES, cursor)
+
+
+def test_counts_generated_ideas():
+    metrics = {"ideas_generated": 0}
+    IdeaSpaceEnumerator(CONCEPTS, CHALLENGES, metrics=metrics).take(10)
+    assert metrics["ideas_generated"] == 10
+
+
+def test_batch_draws_distinct_concept_pairs():
+    batch = IdeaBatch.draw(CONCEPTS, CHALLENGES, 5000, seed=4)
+    assert len(batch) == 5000
+    assert all(row["concept_a"] != row["concept_b"] for row in batch.indices)
+    assert set(batch) <= all_ideas()
+    assert batch[10:20].tolist() == batch.tolist()[10:20]
@@ -0,0 +1,46 @@
+import pytest
+
+from ai_ideation_engine import EnhancedAIIdeationEngine
+from pipeline import ConceptPipeline, evaluate_concept
+from specification import as_dict
+
+CONCEPTS = [f"Concept {index}" for index in range(20)]
+SEED = 11
+
+
+def plain(result):
+    return dict(result, spec=as_dict(result["spec"]), refined_spec=as_dict(result["refined_spec"]))
+
+
+def run_pipeline(engine, tmp_path, executor="thread", workers=2, ordered=True):
+    pipeline = ConceptPipeline(engine, workers=workers, executor=executor, ordered=ordered, seed=SEED,
+                               specs_dir=str(tmp_path / f"specs-{executor}-{workers}"), save_to_knowledge_base=False)
+    return sorted((plain(result) for result in pipeline.run(CONCEPTS)), key=lambda result: result["concept"])
+
+
+def parent_engine(tmp_path):
+    return EnhancedAIIdeationEngine(spec_seed=SEED, db_path=str(tmp_path / "kb.db"))
+
+
+@pytest.mark.parametrize("executor,workers,ordered", [("thread", 3, False), ("process", 2, True)])
+def test_results_do_not_depend_on_scheduling(tmp_path, executor, workers, ordered):
+    engine = parent_engine(tmp_path)
+    assert run_pipeline(engine, tmp_path, executor, workers, ordered) == run_pipeline(engine, tmp_path, "thread", 1)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_workers_use_the_parent_engine_configuration(tmp_path, executor):
+    engine = parent_engine(tmp_path)
+    engine.update_ethical_guidelines({"diversity": "Increase focus on generating diverse ideas"})
+    engine.concepts = engine.concepts + ["swarm intelligence"]
+    engine.configure_refinement(rounds=5, selections_per_round=2)
+
+    results = run_pipeline(engine, tmp_path, executor)
+
+    assert any("Diversity" in consideration for result in results
+               for consideration in result["refined_spec"]["ethical_considerations"])
+    assert all(len(result["refined_spec"]["key_features"]) == len(result["spec"]["key_features"]) + 10
+               for result in results)
+    # Identical to evaluating every concept on the parent engine itself
+    expected = [plain(evaluate_concept(engine, concept, SEED)) for concept in CONCEPTS]
+    assert results == sorted(expected, key=lambda result: result["concept"])
@@ -0,0 +1,55 @@
+import random
+
+from ai_ideation_engine import EnhancedAIIdeationEngine
+from instrumentation import instrumentation
+
+
+class PathSink:
+    def __init__(self):
+        self.paths = []
+
+    def record(self, span):
+        self.paths.append(span.path)
+
+    def export(self, snapshot):
+        return None
+
+
+def traced(run):
+    sink = PathSink()
+    sinks = instrumentation.sinks
+    instrumentation.configure(sinks=[sink])
+    try:
+        run()
+    finally:
+        instrumentation.configure(sinks=sinks)
+    return sink.paths
+
+
+def engine(seed=3):
+    return EnhancedAIIdeationEngine(db_path=":memory:", spec_seed=seed)
+
+
+def test_feedback_spans_nest_under_refine_concept():
+    ideation = engine()
+    ideation.configure_refinement(selections_per_round=3)
+    paths = traced(lambda: ideation.refine_concept("Concept"))
+    assert paths.count("AIIdeationEngine.refine_concept > EngineExpert.feedback") == 9
+    assert paths.count("AIIdeationEngine.refine_concept > AIIdeationEngine.apply_feedback") == 9
+
+
+def test_feedback_spans_nest_under_refine_concepts():
+    ideation = engine()
+    paths = traced(lambda: ideation.refine_concepts(["A", "B", "C"], max_workers=3))
+    assert paths.count("AIIdeationEngine.refine_concepts > EngineExpert.feedback") == 9
+
+
+def test_refinement_does_not_depend_on_worker_count():
+    results = []
+    for max_workers in (1, 4):
+        # Refinement draws from the engine's rng, the random module by default
+        random.seed(7)
+        ideation = engine()
+        ideation.configure_refinement(selections_per_round=3, max_workers=max_workers)
+        results.append(ideation.refine_concepts(["A", "B", "C"], max_workers=max_workers))
+    assert results[0] == results[1]
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+from llm_backend import FakeBackend
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "system"))
+
+from research_coordinator import ResearchCoordinator  # noqa: E402
+
+
+def test_entry_point_imports():
+    result = subprocess.run([sys.executable, os.path.join(REPO_ROOT, "system__main__.py"), "--help"],
+                            capture_output=True, text=True, cwd=REPO_ROOT)
+    assert result.returncode == 0, result.stderr
+    assert "--offline" in result.stdout
+
+
+def test_long_paper_is_analyzed_in_chunks(tmp_path):
+    backend = FakeBackend()
+    coordinator = ResearchCoordinator(backend, chunk_tokens=200, cache_path=str(tmp_path / "cache.db"))
+    text = "\n\n".join(f"{number} Section\n" + "Findings about autonomous systems. " * 40 for number in range(1, 6))
+
+    analysis = coordinator.analyze_paper(text, "https://example.org/paper.pdf")
+
+    chunk_calls = [user for _, _, user in backend.calls if "Analyze only this part" in user]
+    assert len(chunk_calls) > 1
+    final_prompt = backend.calls[-1][2]
+    assert f"analyzed in {len(chunk_calls)} parts" in final_prompt
+    assert analysis.startswith("[gpt-4")
+
+    # Every response is cached, so an offline rerun makes no backend calls
+    calls = len(backend.calls)
+    offline = ResearchCoordinator(backend, chunk_tokens=200, cache_path=str(tmp_path / "cache.db"), offline=True)
+    assert offline.analyze_paper(text, "https://example.org/paper.pdf") == analysis
+    assert len(backend.calls) == calls
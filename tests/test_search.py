@@ -0,0 +1,31 @@
+from ai_ideation_engine import EnhancedAIIdeationEngine
+
+
+def engine(tmp_path):
+    ideation = EnhancedAIIdeationEngine(spec_seed=5, db_path=str(tmp_path / "kb.db"))
+    names = ["Energy efficiency grid", "Blockchain ledger", "AI tutor", "Quantum sensor", "Urban energy planner"]
+    ideation.add_concepts_bulk([(name, ideation.develop_specification(name)) for name in names])
+    return ideation
+
+
+def test_fts_matches_words_and_prefixes(tmp_path):
+    ideation = engine(tmp_path)
+    assert ideation.fts_enabled
+    assert {name for name, _ in ideation.search_concepts("energy eff")} == {"Energy efficiency grid"}
+    # Whole words only: "AI" is not found inside "Blockchain"
+    assert {name for name, _ in ideation.search_concepts("AI", limit=None)} >= {"AI tutor"}
+    assert "Blockchain ledger" not in {name for name, _ in ideation.search_concepts("ain", prefix=False)}
+
+
+def test_queries_without_words_fall_back_to_like(tmp_path):
+    ideation = engine(tmp_path)
+    assert len(ideation.search_concepts("")) == 5
+    assert ideation.search_concepts("?!") == []
+
+
+def test_counts_agree_with_search(tmp_path):
+    ideation = engine(tmp_path)
+    queries = ["energy", "AI", "", "?!", "quantum sensor", "energy"]
+    counts = ideation.count_concept_matches(queries)
+    assert list(counts) == ["energy", "AI", "", "?!", "quantum sensor"]
+    assert counts == {query: len(ideation.search_concepts(query)) for query in counts}
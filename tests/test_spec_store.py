@@ -0,0 +1,56 @@
+import json
+import sqlite3
+
+from ai_ideation_engine import EnhancedAIIdeationEngine
+from spec_store import SpecStore, dedupe_database
+from specification import as_dict
+
+
+def spec(name, features):
+    return {"name": name, "purpose": f"To address {name}", "key_features": features,
+            "integration_points": ["Cities of Light"], "potential_challenges": [],
+            "required_resources": ["compute"], "ethical_considerations": ["Safety: first", "Privacy: always"]}
+
+
+def as_plain(specs):
+    return [as_dict(s) for s in specs]
+
+
+def test_round_trip_keeps_list_order(tmp_path):
+    engine = EnhancedAIIdeationEngine(db_path=str(tmp_path / "kb.db"))
+    specs = [spec("A", ["zeta", "alpha"]), spec("A", ["alpha", "zeta"]), spec("A", ["zeta", "alpha"])]
+    engine.add_concept_to_knowledge_base("A", specs[0])
+    engine.add_concepts_bulk([("B", specs[1]), ("C", specs[2])])
+
+    assert as_plain(engine.load_specifications()) == specs
+    # The first and last specs are identical, the middle one differs only in order
+    assert SpecStore(engine.knowledge_base).stats() == {"references": 3, "inline": 0, "blobs": 2}
+
+
+def test_dedupe_migrates_inline_specs(tmp_path):
+    path = str(tmp_path / "old.db")
+    specs = [spec(name, ["zeta", "alpha", name]) for name in ("A", "B")] * 3
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE concepts (id INTEGER PRIMARY KEY, name TEXT, description TEXT)")
+    conn.execute("CREATE TABLE specifications (id INTEGER PRIMARY KEY, concept_id INTEGER, spec_json TEXT)")
+    conn.executemany("INSERT INTO concepts (id, name, description) VALUES (?, ?, ?)",
+                     [(i, s["name"], s["purpose"]) for i, s in enumerate(specs, 1)])
+    conn.executemany("INSERT INTO specifications (concept_id, spec_json) VALUES (?, ?)",
+                     [(i, json.dumps(s)) for i, s in enumerate(specs, 1)])
+    conn.commit()
+    conn.close()
+
+    engine = EnhancedAIIdeationEngine(db_path=path)
+    assert as_plain(engine.load_specifications()) == specs
+    engine.knowledge_base.close()
+
+    stats = dedupe_database(path, batch_size=4)
+    assert (stats["moved"], stats["references"], stats["inline"], stats["blobs"]) == (6, 6, 0, 2)
+
+    engine = EnhancedAIIdeationEngine(db_path=path)
+    assert as_plain(engine.load_specifications()) == specs
+    refcounts = engine.knowledge_base.execute("SELECT refcount FROM spec_blobs ORDER BY refcount").fetchall()
+    assert refcounts == [(3,), (3,)]
+    # A second run has nothing left to move and keeps the counts
+    engine.knowledge_base.close()
+    assert dedupe_database(path)["moved"] == 0
@@ -0,0 +1,72 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from synergy import SynergyIndex
+
+
+def random_tag_sets(seed, concepts=300, tags=40):
+    rng = random.Random(seed)
+    # Skewed tag popularity and repeated tag sets, like tags taken from generated features
+    weights = [1 / (tag + 1) for tag in range(tags)]
+    tag_sets = {}
+    for concept_id in range(1, concepts + 1):
+        if concept_id > 1 and rng.random() < 0.2:
+            tag_sets[concept_id] = tag_sets[rng.randrange(1, concept_id)]
+        else:
+            tag_sets[concept_id] = frozenset(rng.choices(range(tags), weights, k=rng.randint(0, 7)))
+    return tag_sets
+
+
+def brute_force(tag_sets, metric, min_common_tags=2, max_tag_frequency=None):
+    frequency = {}
+    for tags in tag_sets.values():
+        for tag in tags:
+            frequency[tag] = frequency.get(tag, 0) + 1
+    skipped = {tag for tag, count in frequency.items() if max_tag_frequency is not None and count > max_tag_frequency}
+    scores = {}
+    for a, b in combinations(sorted(tag_sets), 2):
+        tags_a, tags_b = tag_sets[a] - skipped, tag_sets[b] - skipped
+        shared = len(tags_a & tags_b)
+        if shared >= min_common_tags:
+            scores[(a, b)] = shared if metric == "shared" else shared / len(tags_a | tags_b)
+    return scores
+
+
+def build(tag_sets):
+    index = SynergyIndex()
+    for concept_id, tags in tag_sets.items():
+        index.add(concept_id, tags)
+    return index
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("metric", ["shared", "jaccard"])
+@pytest.mark.parametrize("k", [1, 10, 50, 100000])
+@pytest.mark.parametrize("max_tag_frequency", [None, 60])
+def test_top_pairs_match_brute_force(seed, metric, k, max_tag_frequency):
+    tag_sets = random_tag_sets(seed)
+    expected = brute_force(tag_sets, metric, max_tag_frequency=max_tag_frequency)
+    pairs = build(tag_sets).top_pairs(k, metric, max_tag_frequency=max_tag_frequency)
+
+    assert len(pairs) == min(k, len(expected))
+    assert len({(a, b) for a, b, _ in pairs}) == len(pairs)
+    for a, b, score in pairs:
+        assert a < b and score == pytest.approx(expected[(a, b)])
+    # Ties may be broken differently, but the scores of the top k must be the same
+    assert [score for _, _, score in pairs] == pytest.approx(sorted(expected.values(), reverse=True)[:k])
+
+
+def test_incremental_updates_match_brute_force():
+    # Every concept is first indexed with other tags, then re-added with its final ones
+    tag_sets = random_tag_sets(4)
+    index = build(random_tag_sets(5))
+    for concept_id, tags in tag_sets.items():
+        index.add(concept_id, tags)
+    assert len(index) == len(tag_sets)
+    for metric in ("shared", "jaccard"):
+        expected = brute_force(tag_sets, metric)
+        pairs = index.top_pairs(100, metric)
+        assert all(score == pytest.approx(expected[(a, b)]) for a, b, score in pairs)
+        assert [score for _, _, score in pairs] == pytest.approx(sorted(expected.values(), reverse=True)[:100])